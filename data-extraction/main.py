@@ -1,7 +1,6 @@
 ﻿#!/usr/bin/env python3
 import os
 import subprocess
-import shutil
 
 REPO_URL = "https://github.com/google/dfindexeddb.git"
 REPO_NAME = "dfindexeddb"
@@ -10,41 +9,36 @@ if not os.path.exists(REPO_NAME):
     subprocess.run(["git", "clone", REPO_URL])
 
 os.chdir(REPO_NAME)
-subprocess.run(["sudo", "apt", "update"])
-subprocess.run(["sudo", "apt", "install", "libsnappy-dev"])
-subprocess.run(["python3", "-m", "venv", "venv"])
+# Set up the environment in a single shell session, stopping at the first
+# failing step. apt is skipped when libsnappy-dev is already installed and
+# the venv is only created once; orjson is optional (faster JSON output).
+subprocess.run(
+    "(dpkg -s libsnappy-dev >/dev/null 2>&1 || "
+    "(sudo apt update && sudo apt install libsnappy-dev)) && "
+    "([ -x venv/bin/python ] || python3 -m venv venv) && "
+    "venv/bin/python -m pip install . orjson",
+    shell=True, check=True, executable="/bin/bash"
+)
 venv_python = os.path.join("venv", "bin", "python")
-subprocess.run([venv_python, "-m", "pip", "install", "."])
 
-# Move the extraction scripts to the dfindexeddb directory
+# The extraction scripts are run in place from the parent directory; the
+# venv provides dfindexeddb, so they do not need to be copied here
 parent_dir = os.path.dirname(os.getcwd())
-script1_src = os.path.join(parent_dir, "replychains-extraction.py")
-script2_src = os.path.join(parent_dir, "conversations-extraction.py")
-script3_src = os.path.join(parent_dir, "people-extraction.py")
+replychains_script = os.path.join(parent_dir, "replychains-extraction.py")
+conversations_script = os.path.join(parent_dir, "conversations-extraction.py")
+people_script = os.path.join(parent_dir, "people-extraction.py")
 
-if os.path.exists(script1_src):
-    shutil.copy2(script1_src, ".")
-if os.path.exists(script2_src):
-    shutil.copy2(script2_src, ".")
-if os.path.exists(script3_src):
-    shutil.copy2(script3_src, ".")
 # Sobstituting the path to your IndexedDB LevelDB folder of Microsoft Teams
 leveldb_path = "/mnt/c/Users/*/MSTeams_8wekyb3d8bbwe/LocalCache/Microsoft/MSTeams/EBWebView/WV2Profile_tfw/IndexedDB/https_teams.microsoft.com_0.indexeddb.leveldb/"
-subprocess.run([
-    venv_python,
-    "replychains-extraction.py",
-    leveldb_path,
-    "output_replychains.json"
-])
-subprocess.run([
-    venv_python,
-    "conversations-extraction.py",
-    leveldb_path,
-    "output_conversations.json"
-])
-subprocess.run([
-    venv_python,
-    "people-extraction.py",
-    leveldb_path,
-    "output_people.json"
-])
\ No newline at end of file
+# The three extractions read the same folder independently: run them
+# concurrently and wait for all of them
+processes = [
+    subprocess.Popen([venv_python, script, leveldb_path, output_json])
+    for script, output_json in (
+        (replychains_script, "output_replychains.json"),
+        (conversations_script, "output_conversations.json"),
+        (people_script, "output_people.json"),
+    )
+]
+for process in processes:
+    process.wait()
\ No newline at end of file
@@ -7,123 +7,400 @@ import pathlib
 import json
 from dfindexeddb.indexeddb.chromium import record
 import os
+import enum
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-def replychains_extraction(path, output_json):
+# Data (.ldb) and write-ahead log (.log) files of a LevelDB folder
+LEVELDB_SUFFIXES = (".ldb", ".log")
+
+def is_leveldb_file(name):
+    """
+    Filters only valid LevelDB files by their name.
+    """
+    return (
+        name.endswith(LEVELDB_SUFFIXES) or
+        name.startswith("MANIFEST") or
+        name == "CURRENT"
+    )
+
+# An .ldb table ends with a 48-byte footer whose last 8 bytes are the table
+# magic number 0xdb4775248b80fb57 (little-endian); in log-format files
+# (.log, MANIFEST) a single record header already takes 7 bytes.
+LEVELDB_TABLE_MAGIC = bytes.fromhex("57fb808b247547db")
+LEVELDB_FOOTER_SIZE = 48
+LEVELDB_LOG_HEADER_SIZE = 7
+
+def has_leveldb_content(entry):
+    """
+    Cheap sanity check on a folder entry before it is parsed: rejects empty
+    or truncated files and tables without the LevelDB footer magic.
+    """
+    name = entry.name
+    try:
+        size = entry.stat(follow_symlinks=False).st_size
+        if name.endswith(".ldb"):
+            if size < LEVELDB_FOOTER_SIZE:
+                return False
+            with open(entry.path, "rb") as f:
+                f.seek(-len(LEVELDB_TABLE_MAGIC), os.SEEK_END)
+                return f.read(len(LEVELDB_TABLE_MAGIC)) == LEVELDB_TABLE_MAGIC
+        if name == "CURRENT":
+            return size > 0
+        return size >= LEVELDB_LOG_HEADER_SIZE
+    except OSError:
+        return False
+
+def scan_file(f):
+    """
+    Reads a single LevelDB file in one pass and returns the database_id of
+    the "replychains" names records found in it, together with the
+    serialized index_id=1 records as (database_id, record) pairs.
+    """
+    database_ids = set()
+    candidates = []
+    add_id = database_ids.add
+    add_candidate = candidates.append
+    try:
+        # The reader expects a Path (it uses .name and .as_posix())
+        for rec in record.ChromiumIndexedDBRecord.FromFile(pathlib.Path(f)):
+            key = rec.key
+            # Key records are dataclasses: one lookup of their __dict__
+            # replaces the repeated getattr() calls
+            key_fields = getattr(key, "__dict__", None) or {}
+            kp = key_fields.get("key_prefix")
+            if not kp:
+                continue
+            # Data records (index_id=1) are the bulk of the folder: test
+            # for them first, the names record is only looked for otherwise
+            index_id = kp.index_id
+            if index_id == 1:
+                database_id = kp.database_id
+                try:
+                    # Keys in sorted order, like every dict built below
+                    add_candidate((database_id, {
+                        "database_id": database_id,
+                        "index_id": index_id,
+                        "key": to_serializable(key),
+                        "object_store_id": kp.object_store_id,
+                        "offset": rec.offset,
+                        "value": to_serializable(rec.value)
+                    }))
+                except Exception as e:
+                    print(f"Record serialization error: {e}")
+            elif (index_id == 0 and kp.object_store_id == 0 and
+                    key_fields.get("object_store_name") == "replychains"):
+                add_id(kp.database_id)
+    except Exception as e:
+        print(f"[WARN] Skipped file {f}: {e}")
+    finally:
+        # The intern table only lives for the scan of one file: pool
+        # workers are reused, and would otherwise keep the strings of
+        # every file they have read
+        _STRINGS.clear()
+    return database_ids, candidates
+
+# Records are written one by one: a large buffer turns the many small
+# writes into few system calls
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+def open_output(output_json, compress):
+    """
+    Opens the output file for binary writing. With compress=True the data
+    is zstd-compressed on the fly; closing the writer closes the file.
+    """
+    f = open(output_json, "wb", buffering=OUTPUT_BUFFER_SIZE)
+    if not compress:
+        return f
+    return zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(f)
+
+def dump_record(entry):
+    """
+    Returns a serialized record as UTF-8 encoded JSON, using orjson when
+    it is installed and the standard json module otherwise.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects e.g. integers wider than 64 bits
+            pass
+    return json.dumps(entry, ensure_ascii=False, indent=2).encode("utf-8")
+
+def replychains_extraction(path, output_json, compress=False):
     """
     Extracts all IndexedDB records with the same database_id as the record
     with object_store_name == "replychains" and with index_id=1.
     Works on both single files and LevelDB folders.
     Skips invalid files (e.g. $I30, desktop.ini, etc).
+    With compress=True the output is written as a zstd stream.
     """
-    path = pathlib.Path(path)
-    # Function to filter only valid LevelDB files
-    def is_leveldb_file(f):
-        name = f.name
-        return (
-            name.startswith("MANIFEST") or
-            name == "CURRENT" or
-            name.endswith(".ldb") or
-            name.endswith(".log")
-        )
     # Choose the right reader
-    if path.is_dir():
-        # Filter only valid files
-        files = [f for f in path.iterdir() if f.is_file() and is_leveldb_file(f)]
-        def all_records():
-            for f in files:
-                try:
-                    yield from record.ChromiumIndexedDBRecord.FromFile(f)
-                except Exception as e:
-                    print(f"[WARN] Skipped file {f}: {e}")
-        record_iter = all_records()
+    if os.path.isdir(path):
+        # List the folder once and filter only valid files: the cheap name
+        # check goes first, and scandir already knows the entry type. Files
+        # that cannot hold LevelDB data are skipped before being parsed.
+        # Plain string paths are handed to the workers, sorted for a
+        # deterministic output order; scan_file turns them into Paths.
+        files = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if is_leveldb_file(entry.name) and entry.is_file(follow_symlinks=False):
+                    if has_leveldb_content(entry):
+                        files.append(entry.path)
+                    elif entry.name.endswith(".ldb"):
+                        # An empty .log is the normal state after a
+                        # compaction: only bad tables are reported
+                        print(f"[WARN] Skipped file {entry.path}: truncated or not a LevelDB table")
+        files.sort()
     else:
-        record_iter = record.ChromiumIndexedDBRecord.FromFile(path)
-    # First step: find all database_id for "replychains" and save the records
-    database_ids = set()
-    records = []
-    def save_nameskey_records(record_iter):
-        for rec in record_iter:
-            key = rec.key
-            if hasattr(key, "object_store_name") and getattr(key, "object_store_name", None) == "replychains":
-                kp = getattr(key, "key_prefix", None)
-                if kp and kp.object_store_id == 0 and kp.index_id == 0:
-                    database_ids.add(kp.database_id)
-
-    if path.is_dir():
-        for f in files:
-            try:
-                save_nameskey_records(record.ChromiumIndexedDBRecord.FromFile(f))
-            except Exception as e:
-                print(f"[WARN] Skipped file {f}: {e}")
+        files = [path]
+    # Files are scanned in parallel; the database_id of "replychains" may be
+    # found in any file, so the candidates are filtered once all are done.
+    # A single file is scanned in this process, without pool or pickling.
+    if len(files) < 2:
+        scans = [scan_file(f) for f in files]
     else:
-        save_nameskey_records(record.ChromiumIndexedDBRecord.FromFile(path))
+        with ProcessPoolExecutor() as executor:
+            scans = list(executor.map(scan_file, files))
+    database_ids = set()
+    for file_ids, _ in scans:
+        database_ids.update(file_ids)
 
     if not database_ids:
         print("No database_id found for object_store_name='replychains'")
-        with open(output_json, "w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False, indent=2, sort_keys=True)
-        print(f"Saved {len(records)} records to {output_json}")
-        return
-
-    # Second step: extract all desired records for each found database_id
-    def save_datakey_records(record_iter, path_str):
-        for rec in record_iter:
-            kp = getattr(rec.key, "key_prefix", None)
-            if kp and kp.database_id in database_ids and kp.index_id == 1:
-                try:
-                    records.append({
-                        "offset": rec.offset,
-                        "database_id": kp.database_id,
-                        "object_store_id": kp.object_store_id,
-                        "index_id": kp.index_id,
-                        "key": to_serializable(rec.key),
-                        "value": to_serializable(rec.value)
-                    })
-                except Exception as e:
-                    print(f"Record serialization error: {e}")
+        # Nothing can match: drop the candidates without filtering them
+        scans = []
+    count = write_records(iter_records(scans, database_ids), output_json, compress)
+    print(f"Saved {count} records to {output_json}")
 
-    if path.is_dir():
-        for f in files:
-            try:
-                save_datakey_records(record.ChromiumIndexedDBRecord.FromFile(f), str(f))
-            except Exception as e:
-                print(f"[WARN] Skipped file {f}: {e}")
-    else:
-        save_datakey_records(record.ChromiumIndexedDBRecord.FromFile(path), str(path))
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, indent=2, sort_keys=True)
-    print(f"Saved {len(records)} records to {output_json}")
+def iter_records(scans, database_ids):
+    """
+    Yields, in file order, the scanned records whose database_id is one of
+    database_ids. The candidates of a file are released once consumed.
+    """
+    for i, (_, candidates) in enumerate(scans):
+        scans[i] = None
+        for database_id, entry in candidates:
+            if database_id in database_ids:
+                yield entry
 
-def to_serializable(obj):
+def write_records(records, output_json, compress=False):
     """
-    Recursively serializes complex objects into JSON-friendly dicts,
-    adding '__type__' where appropriate.
+    Writes the records as a JSON array one at a time, without holding the
+    whole output in memory, and returns how many were written.
     """
-    import enum
-    from dataclasses import is_dataclass, asdict
+    count = 0
+    with open_output(output_json, compress) as f:
+        f.write(b"[")
+        for entry in records:
+            f.write(b",\n" if count else b"\n")
+            f.write(dump_record(entry))
+            count += 1
+        f.write(b"\n]" if count else b"]")
+    return count
+
+# ------------------------------------------------------------------------------
+# Serialization: an explicit stack instead of recursion, and a handler per
+# concrete type so the common cases skip the isinstance ladder. Dicts are
+# built with their keys already sorted, so the output is deterministic
+# without a sort_keys pass at write time.
+# ------------------------------------------------------------------------------
+
+# Short strings repeat across records (ids, message types, property
+# names): keeping one object per value saves memory, and lets pickle send
+# each distinct string only once when a worker returns its records. The
+# table is emptied after each file by scan_file.
+_STRINGS = {}
+_MAX_INTERNED_LENGTH = 256
+
+def _intern(s):
+    if len(s) > _MAX_INTERNED_LENGTH:
+        return s
+    return _STRINGS.setdefault(s, s)
+
+def _serialize_primitive(obj, out, slot, nested, push):
+    out[slot] = obj
+
+def _serialize_text(obj, out, slot, nested, push):
+    out[slot] = _intern(obj)
+
+def _plain(v):
+    return _intern(v) if type(v) is str else v
+
+def _all_primitive(values):
+    primitive_types = _PRIMITIVE_TYPES
+    for v in values:
+        if type(v) not in primitive_types:
+            return False
+    return True
+
+def _serialize_str(obj, out, slot, nested, push):
+    out[slot] = str(obj)
+
+def _serialize_enum(obj, out, slot, nested, push):
+    out[slot] = obj.name
+
+def _serialize_key(k):
+    if type(k) is str:
+        return _intern(k)
+    return k if type(k) in _PRIMITIVE_TYPES else to_serializable(k)
+
+def _sorted_keys(keys):
+    try:
+        return sorted(keys)
+    except TypeError:
+        # Keys of mixed types cannot be ordered
+        return list(keys)
+
+def _serialize_dict(obj, out, slot, nested, push):
+    # Flat dicts of primitives are copied directly, without the stack
+    if _all_primitive(obj.values()):
+        out[slot] = {_serialize_key(k): _plain(obj[k]) for k in _sorted_keys(obj)}
+        return
+    result = out[slot] = {}
+    for k in _sorted_keys(obj):
+        v = obj[k]
+        k = _serialize_key(k)
+        result[k] = None
+        push((v, result, k, nested))
+
+def _serialize_sequence(obj, out, slot, nested, push):
+    if _all_primitive(obj):
+        out[slot] = [_plain(v) for v in obj]
+        return
+    result = out[slot] = [None] * len(obj)
+    for i, v in enumerate(obj):
+        push((v, result, i, nested))
+
+def _serialize_set(obj, out, slot, nested, push):
+    if _all_primitive(obj):
+        out[slot] = [_plain(v) for v in obj]
+        return
+    # asdict() does not descend into sets, so their items start a new level
+    result = out[slot] = [None] * len(obj)
+    for i, v in enumerate(obj):
+        push((v, result, i, False))
+
+_MISSING = object()
+_NO_FIELDS = {}
+
+@lru_cache(maxsize=None)
+def _field_names(cls):
+    # fields() rebuilds its tuple on every call; the names never change.
+    # Returns the sorted names without and with the '__type__' key.
+    names = [f.name for f in fields(cls)]
+    return tuple(sorted(names)), tuple(sorted(names + ['__type__']))
+
+def _serialize_dataclass(obj, out, slot, nested, push):
+    # Dataclasses nested in another dataclass get no '__type__', as asdict() did
+    result = out[slot] = {}
+    names, typed_names = _field_names(obj.__class__)
+    # Field values are read straight from the instance dict; getattr() is
+    # only needed for slotted classes or fields not stored on the instance
+    get = getattr(obj, '__dict__', _NO_FIELDS).get
+    if nested:
+        for name in names:
+            v = get(name, _MISSING)
+            result[name] = None
+            push((getattr(obj, name) if v is _MISSING else v, result, name, True))
+        return
+    for name in typed_names:
+        if name == '__type__':
+            result[name] = obj.__class__.__name__
+        else:
+            v = get(name, _MISSING)
+            result[name] = None
+            push((getattr(obj, name) if v is _MISSING else v, result, name, True))
+
+def _serialize_object(obj, out, slot, nested, push):
+    result = out[slot] = {}
+    attrs = obj.__dict__
+    keys = [k for k in attrs if not k.startswith('_')]
+    keys.append('__type__')
+    for k in _sorted_keys(keys):
+        if k == '__type__':
+            result[k] = obj.__class__.__name__
+        else:
+            result[k] = None
+            push((attrs[k], result, k, False))
+
+_PRIMITIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+_DISPATCH = {
+    str: _serialize_text,
+    int: _serialize_primitive,
+    float: _serialize_primitive,
+    bool: _serialize_primitive,
+    type(None): _serialize_primitive,
+    dict: _serialize_dict,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+    set: _serialize_set,
+    bytes: _serialize_str,
+}
+
+def _resolve_handler(obj):
+    # Same checks, in the same order, as the original recursive version
     if is_dataclass(obj):
-        result = {k: to_serializable(v) for k, v in asdict(obj).items()}
-        result['__type__'] = obj.__class__.__name__
-        return result
+        handler = _serialize_dataclass
     elif isinstance(obj, enum.Enum):
-        return obj.name
+        handler = _serialize_enum
     elif isinstance(obj, dict):
-        return {to_serializable(k): to_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple, set)):
-        return [to_serializable(i) for i in obj]
+        handler = _serialize_dict
+    elif isinstance(obj, (list, tuple)):
+        handler = _serialize_sequence
+    elif isinstance(obj, set):
+        handler = _serialize_set
     elif hasattr(obj, '__dict__'):
-        result = {k: to_serializable(v) for k, v in obj.__dict__.items() if not k.startswith('_')}
-        result['__type__'] = obj.__class__.__name__
-        return result
+        handler = _serialize_object
     elif isinstance(obj, (str, int, float, bool)) or obj is None:
-        return obj
+        handler = _serialize_primitive
     else:
-        return str(obj)
+        handler = _serialize_str
+    # Classes themselves all share type(obj), so only cache instances
+    if not isinstance(obj, type):
+        _DISPATCH[type(obj)] = handler
+    return handler
+
+def to_serializable(obj):
+    """
+    Serializes complex objects into JSON-friendly dicts,
+    adding '__type__' where appropriate.
+    """
+    # Primitives, the most common leaves, are returned as is
+    if type(obj) in _PRIMITIVE_TYPES:
+        return obj
+    root = [None]
+    stack = deque([(obj, root, 0, False)])
+    pop, push = stack.pop, stack.append
+    dispatch = _DISPATCH
+    while stack:
+        obj, out, slot, nested = pop()
+        handler = dispatch.get(type(obj))
+        if handler is None:
+            handler = _resolve_handler(obj)
+        handler(obj, out, slot, nested, push)
+    return root[0]
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Extract IndexedDB replychains records")
     parser.add_argument("input_path", help="IndexedDB/LevelDB file or folder")
     parser.add_argument("output_json", help="Output JSON file")
+    parser.add_argument("--zstd", action="store_true",
+                        help="Compress the output with zstd (requires the zstandard package)")
     args = parser.parse_args()
-    replychains_extraction(args.input_path, args.output_json)
\ No newline at end of file
+    if args.zstd and zstandard is None:
+        parser.error("--zstd requires the zstandard package")
+    replychains_extraction(args.input_path, args.output_json, args.zstd)
\ No newline at end of file
@@ -31,8 +31,9 @@ import json
 import os
 import re
 import calendar
-import codecs
+import threading
 from datetime import datetime
+import jarray
 
 from org.sleuthkit.autopsy.ingest import (
     DataSourceIngestModule,
@@ -45,6 +46,10 @@ from org.sleuthkit.autopsy.casemodule import Case
 from org.sleuthkit.datamodel import BlackboardArtifact, BlackboardAttribute
 from org.sleuthkit.autopsy.datamodel import ContentUtils
 from java.io import File
+from java.lang import Runtime, String
+from java.nio.file import Files, Paths
+from java.util import ArrayList
+from java.util.concurrent import Callable, Executors
 
 # Python 2/3 compatibility for string types
 try:
@@ -63,9 +68,356 @@ except NameError:
     def unichr(x):
         return chr(x)
 
+try:
+    intern
+except NameError:
+    from sys import intern
+
+# dict.values() builds a list under Python 2, itervalues() does not
+if hasattr(dict, "itervalues"):
+    _itervalues = dict.itervalues
+else:
+    _itervalues = dict.values
+
 # Constants
 ARTIFACT_PREFIX = "Microsoft Teams"
 
+# Compact JSON serialization used for STRING attributes, created once rather
+# than by every json.dumps call with non-default options
+_compact_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+# Format used for timestamps stored as STRING attributes
+DISPLAY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Teams ISO8601 timestamps, with or without fractional seconds. These accept
+# exactly what strptime accepts for "%Y-%m-%dT%H:%M:%S[.%f]", e.g.
+# single-digit months, without its per-call cost; the whole string must match.
+_RE_ISO8601 = re.compile(
+    r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])"
+    r"[Tt](2[0-3]|[0-1]\d|\d):([0-5]\d|\d):(6[0-1]|[0-5]\d|\d)\Z")
+_RE_ISO8601_FRACTION = re.compile(
+    r"(\d\d\d\d)-(1[0-2]|0[1-9]|[1-9])-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])"
+    r"[Tt](2[0-3]|[0-1]\d|\d):([0-5]\d|\d):(6[0-1]|[0-5]\d|\d)\.\d{1,6}\Z")
+
+# JSON files up to this size are read straight from the image into memory;
+# larger ones are first copied to the temp directory
+IN_MEMORY_MAX_SIZE = 64 * 1024 * 1024
+
+# Each parallel file task holds its raw bytes, the decoded text and the parsed
+# tree at once, so the pool is kept small and files larger than
+# PARALLEL_MAX_SIZE are processed one at a time before it starts
+PARALLEL_MAX_THREADS = 4
+PARALLEL_MAX_SIZE = 16 * 1024 * 1024
+
+# Staged artifacts are posted in batches of this size while a message file
+# is processed, so they are not all held until the end of the file
+POST_BATCH_SIZE = 500
+
+# Number of cleaned message bodies kept before the cache is cleared
+CLEAN_HTML_CACHE_SIZE = 4096
+
+# Number of contact name lookups, and of enriched IDs, kept before the
+# respective cache is cleared
+CONTACT_NAME_CACHE_SIZE = 8192
+
+# Number of converted timestamps kept before the cache is cleared
+TIMESTAMP_CACHE_SIZE = 8192
+
+# Number of participant dict key layouts whose ID-like keys are cached
+ID_KEY_CACHE_SIZE = 1024
+
+# Serialized links/files/mentions lists up to JSON_LIST_CACHE_MAX_LENGTH
+# characters are cached, up to JSON_LIST_CACHE_SIZE of them
+JSON_LIST_CACHE_SIZE = 2048
+JSON_LIST_CACHE_MAX_LENGTH = 4096
+
+# Regular expressions used to clean HTML message content
+_RE_LINK_ONLY_P = re.compile(r'\s*<p>?\s*<a [^>]*href="([^"]+)"[^>]*>[^<]+</a>\s*</p>?\s*$', re.IGNORECASE)
+_RE_LINK_ONLY = re.compile(r'\s*<a [^>]*href="([^"]+)"[^>]*>[^<]+</a>\s*$', re.IGNORECASE)
+_RE_BLOCKQUOTE_REPLY = re.compile(
+    r'<blockquote[^>]*?(?:itemscope[^>]*?)?itemtype="http://schema.skype.com/Reply"[^>]*>([\s\S]*?)</blockquote>', re.IGNORECASE)
+_RE_BLOCKQUOTE_FORWARD = re.compile(
+    r'<blockquote[^>]*?(?:itemscope[^>]*?)?itemtype="http://schema.skype.com/Forward"[^>]*>([\s\S]*?)</blockquote>', re.IGNORECASE)
+# "amsimage" in any ASCII letter case, as matched by content.lower(). Unlike
+# IGNORECASE, the classes do not also match e.g. U+017F for "s".
+_RE_AMSIMAGE = re.compile(r"[aA][mM][sS][iI][mM][aA][gG][eE]")
+_RE_STRONG = re.compile(r'<strong[^>]*>([^<]+)</strong>', re.IGNORECASE)
+_RE_SPAN_ITEMID = re.compile(r'<span[^>]*itemid\s*=\s*"([^"]+)"', re.IGNORECASE)
+_RE_A_HREF = re.compile(r'<a [^>]*href="([^"]+)"[^>]*>', re.IGNORECASE)
+_RE_A_BLOCK = re.compile(r'<a [^>]*href="([^"]+)"[^>]*>[^<]*</a>', re.IGNORECASE)
+_RE_LINE_BREAK = re.compile(r"<br>|<br/>|<br />|</p\s*>")
+_RE_ANY_TAG = re.compile(r"<[^>]+>")
+# Up to two backslashes before a quote are dropped, as two passes of a
+# single-backslash substitution would
+_RE_ESCAPED_QUOTE = re.compile(r"\\{1,2}(['\"])")
+# Escaped and CRLF line breaks. A CR before an escaped CRLF is dropped with
+# it, as the CRLF left by a first replace() pass would be.
+_RE_NEWLINES = re.compile(r"\r?\\r\\n|\r\n|\\n")
+
+# Spaces left inside parentheses and before commas when mention name parts
+# are joined
+_RE_PUNCT_FIX = re.compile(r" ([,)])|(\() ")
+
+# Non-breaking and figure spaces in message text become plain spaces
+_WS_TRANSLATE = {0xA0: u" ", 0x2007: u" ", 0x202F: u" "}
+
+# HTML entities decoded in message text. "&amp;" followed by another entity
+# name is decoded twice ("&amp;lt;" gives "<"), as the original chain of
+# replace() calls did. Non-breaking spaces become plain spaces.
+_RE_HTML_ENTITY = re.compile(r"&(?:amp;)?(lt|gt|quot|#39|nbsp);|&amp;")
+_HTML_ENTITIES = {"lt": "<", "gt": ">", "quot": "\"", "#39": "'", "nbsp": " "}
+
+
+def _html_entity_repl(match):
+    name = match.group(1)
+    return _HTML_ENTITIES[name] if name else "&"
+
+
+# Fields read from call recording XML content: (field, tag, attribute,
+# attribute that must come before it, whether the value may be empty). Each
+# is found by _find_tag_attr as re.search would find e.g.
+# <RecordingStatus[^>]*status="([^"]+)", or for the call ID
+# <Id[^>]*type="callId"[^>]*value="([^"]+)".
+_REC_FIELDS = (
+    ("status", "<RecordingStatus", 'status="', None, False),
+    ("original_name", "<OriginalName", 'v="', None, False),
+    ("initiator", "<RecordingInitiatorId", 'value="', None, False),
+    ("terminator", "<RecordingTerminatorId", 'value="', None, False),
+    ("call_id", "<Id", 'value="', 'type="callId"', False),
+    ("duration", "<RecordingContent", 'duration="', None, False),
+    ("timestamp", "<RecordingContent", 'timestamp="', None, False),
+    ("meeting_organizer", "<MeetingOrganizerId", 'value="', None, True),
+)
+
+# Mathematical bold letters and digits, used for reply and forward headers
+_BOLD_TRANSLATE = {}
+for _i in range(26):
+    _BOLD_TRANSLATE[ord('A') + _i] = unichr(0x1D400 + _i)
+    _BOLD_TRANSLATE[ord('a') + _i] = unichr(0x1D41A + _i)
+for _i in range(10):
+    _BOLD_TRANSLATE[ord('0') + _i] = unichr(0x1D7CE + _i)
+del _i
+
+
+def _punct_fix_repl(match):
+    return match.group(1) or match.group(2)
+
+
+def _bold_unicode(text):
+    """Convert text to bold unicode characters."""
+    return text.translate(_BOLD_TRANSLATE)
+
+
+# Message fields read by each message processor in one map(msg.get, ...)
+# call. A missing content is None rather than "", which converts to the
+# same empty string.
+MESSAGE_FIELDS = ("sequenceId", "content", "id", "creator", "imDisplayName", "messageType", "originalArrivalTime")
+CALL_ACTIVITY_FIELDS = ("sequenceId", "content", "id", "messageType", "originalArrivalTime")
+MEETING_FIELDS = ("sequenceId", "content", "id", "creator", "messageType", "originalArrivalTime")
+
+# Participant dict keys containing one of these, in any case, hold IDs
+ID_KEY_PARTS = ("id", "participant", "user", "mri")
+
+
+def _parse_iso8601(val_clean):
+    """
+    Parse an ISO8601 timestamp without its trailing Z into a datetime, with
+    second precision. Raises ValueError if it does not match the format.
+    """
+    # Fractional seconds are truncated to microseconds, at most six digits
+    if "." in val_clean:
+        match = _RE_ISO8601_FRACTION.match(val_clean[:26])
+    else:
+        match = _RE_ISO8601.match(val_clean[:19])
+    if match is None:
+        raise ValueError("time data %r does not match ISO8601 format" % val_clean)
+    return datetime(*map(int, match.groups()))
+
+
+def _timestamp_value(val, for_datetime_attr):
+    """Convert a non-empty timestamp value, see TeamsReplychainJSONParser._convert_timestamp."""
+    try:
+        # Numbers skip the string checks
+        if isinstance(val, (int, float)):
+            v = float(val)
+            if v > 9999999999:
+                v = v / 1000.0
+            if for_datetime_attr:
+                return int(v)
+            return datetime.utcfromtimestamp(v).strftime(DISPLAY_TIME_FORMAT)
+        
+        # Handle ISO8601 strings
+        if isinstance(val, basestring) and ("T" in val and ("-" in val or ":" in val)):
+            val_clean = val.rstrip("Z")  # Remove trailing Z if present
+            try:
+                dt = _parse_iso8601(val_clean)
+                if for_datetime_attr:
+                    return calendar.timegm(dt.timetuple())  # Numeric timestamp
+                else:
+                    return dt.strftime(DISPLAY_TIME_FORMAT)  # Formatted string
+            except Exception:
+                # Fallback for string format
+                if not for_datetime_attr:
+                    return val_clean[:19].replace("T", " ")
+                return None
+        
+        # Handle numeric timestamps, in seconds or milliseconds
+        v = float(val)
+        if v > 9999999999:
+            v = v / 1000.0
+        
+        if for_datetime_attr:
+            return int(v)  # Numeric timestamp
+        else:
+            return datetime.utcfromtimestamp(v).strftime(DISPLAY_TIME_FORMAT)  # Formatted string
+            
+    except Exception:
+        if for_datetime_attr:
+            return None
+        else:
+            return unicode(val) if val else u""
+
+
+def _safe_string_extract(val):
+    """Safely extract string value from potentially mixed data types."""
+    # Decoded JSON strings are unicode, checked first with a class comparison
+    if val.__class__ is unicode:
+        return val.strip()
+    if val is None:
+        return ""
+    if isinstance(val, basestring):
+        return val.strip()
+    if isinstance(val, dict):
+        return ""
+    return unicode(val)
+
+
+def _safe_unicode(val):
+    """Safely convert value to unicode string."""
+    # Decoded JSON strings are unicode, checked first with a class comparison
+    if val.__class__ is unicode:
+        return val
+    if val is None:
+        return u""
+    if isinstance(val, unicode):
+        return val
+    if isinstance(val, str):
+        try:
+            return val.decode('utf-8')
+        except UnicodeDecodeError:
+            return val.decode('utf-8', 'replace')
+    return unicode(val)
+
+
+# Characters json escapes in strings when non-ASCII output is allowed
+_RE_JSON_ESCAPE = re.compile(r'[\x00-\x1f\\"]')
+_JSON_ESCAPES = {"\\": "\\\\", '"': '\\"', "\b": "\\b", "\f": "\\f", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _json_escape_repl(match):
+    char = match.group(0)
+    return _JSON_ESCAPES.get(char) or "\\u%04x" % ord(char)
+
+
+def _flat_records_json(records):
+    """
+    Serialize a list of dicts with unicode keys and unicode or null values,
+    e.g. call participants, exactly as _compact_json would. Returns None for
+    any other structure.
+    """
+    esc = _RE_JSON_ESCAPE.sub
+    parts = []
+    for record in records:
+        if record.__class__ is not dict:
+            return None
+        items = []
+        for key, value in record.items():
+            if key.__class__ is not unicode:
+                return None
+            if value.__class__ is unicode:
+                value = u'"' + esc(_json_escape_repl, value) + u'"'
+            elif value is None:
+                value = u"null"
+            else:
+                return None
+            items.append(u'"' + esc(_json_escape_repl, key) + u'":' + value)
+        parts.append(u"{" + u",".join(items) + u"}")
+    return u"[" + u",".join(parts) + u"]"
+
+
+def _load_records(json_path):
+    """Load the records of a JSON file."""
+    # The JVM reads and decodes the file instead of going through a Python
+    # byte string
+    return json.loads(_read_utf8(json_path))
+
+
+def _load_buffer_records(buf):
+    """Load the records of a JSON file read into a Java byte array."""
+    return json.loads(String(buf, "UTF-8"))
+
+
+def _read_utf8(path):
+    """Read a UTF-8 text file with Java NIO."""
+    return String(Files.readAllBytes(Paths.get(path)), "UTF-8")
+
+
+def _find_tag_attr(content, tag, key, after=None, allow_empty=False):
+    """
+    Find the value of an attribute in the first tag that has it, with
+    str.find rather than a regex. Within a tag, that is up to its first
+    '>', the last occurrence of key (e.g. 'status="') with a closed value
+    wins, as the greedy [^>]* of the equivalent pattern would pick.
+    """
+    tag_start = content.find(tag)
+    while tag_start >= 0:
+        start = tag_start + len(tag)
+        end = content.find(">", start)
+        if end < 0:
+            end = len(content)
+        if after is not None:
+            found = content.find(after, start, end)
+            start = found + len(after) if found >= 0 else -1
+        if start >= 0:
+            pos = content.rfind(key, start, end)
+            while pos >= 0:
+                value_start = pos + len(key)
+                value_end = content.find('"', value_start)
+                if value_end > value_start or (allow_empty and value_end == value_start):
+                    return content[value_start:value_end]
+                pos = content.rfind(key, start, pos + len(key) - 1)
+        tag_start = content.find(tag, tag_start + 1)
+    return None
+
+
+def _iter_reaction_users(emotions):
+    """Yield (reaction type, user MRI, time) for each user of each reaction."""
+    for v in emotions.get("values", []):
+        reaction_type = v.get("key")
+        # A chat only uses a handful of reaction keys, so they are interned
+        # like the contact MRIs (only ASCII strings can be interned)
+        if isinstance(reaction_type, basestring):
+            try:
+                reaction_type = intern(str(reaction_type))
+            except UnicodeError:
+                pass
+        users_obj = v.get("users", {})
+        if isinstance(users_obj, dict):
+            for u in users_obj.get("values", []):
+                yield reaction_type, u.get("mri", ""), u.get("time", None)
+
+
+class _ProcessFileTask(Callable):
+    """Process a single JSON file on an executor thread."""
+    
+    def __init__(self, parser, jsonFile):
+        self.parser = parser
+        self.jsonFile = jsonFile
+    
+    def call(self):
+        if not self.parser.context.isJobCancelled():
+            self.parser._process_single_file(self.jsonFile)
+
 
 class TeamsReplychainJSONParserFactory(IngestModuleFactoryAdapter):
     """
@@ -112,17 +464,47 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             context: Ingest job context from Autopsy
         """
         self.context = context
-        bb = Case.getCurrentCase().getServices().getBlackboard()
+        case = Case.getCurrentCase()
+        bb = case.getServices().getBlackboard()
+
+        # The blackboard and temp directory are used for every file
+        self._bb = bb
+        self._tmp_dir = case.getTempDirectory()
 
         # Initialize data storage maps
         self.conversation_tenant_map = {}  # Maps conversation ID to tenant ID
         self.contacts_map = {}  # Maps MRI to display name for participant lookups
+        self._contact_name_cache = {}  # Maps participant IDs to their contact name
+        self._enriched_creator_cache = {}  # Maps participant IDs to their enriched form
+        self._clean_html_cache = {}  # Maps message HTML and forward context to its text
+        self._json_list_cache = {}  # Maps serialized property lists to the parsed list
+        self._id_key_cache = {}  # Maps participant dict key sets to their ID-like keys
+        self._msg_type_text = {}  # Maps handled message types to their unicode form
+        self._ts_cache = {}  # Maps timestamp values and target type to the converted timestamp
+
+        # Artifacts created for the current file, indexed in one batch once the
+        # file is processed. Blackboard.postArtifacts is not available in older
+        # Autopsy versions, where they are indexed one at a time instead. Files
+        # are processed in parallel, so each thread stages its own artifacts.
+        self._staging = threading.local()
+        sk_bb = case.getSleuthkitCase().getBlackboard()
+        self._post_artifacts = getattr(sk_bb, "postArtifacts", None)
 
         # Initialize artifact types for different Teams data categories
         self._initialize_artifact_types(bb)
         
         # Initialize attribute types for all artifacts
         self._initialize_attribute_types(bb)
+        
+        # Handler of each message type, with the counter it adds to. Messages
+        # of the call logs conversation are all handled as call logs.
+        self._msg_handlers = {
+            "RichText/Media_CallRecording": (self._process_call_activity, 'calls_msg'),
+            "RichText/Media_CallTranscript": (self._process_call_activity, 'calls_msg'),
+            "Event/Call": (self._process_meeting_event, 'meetings'),
+            "Text": (self._process_regular_message, 'messages'),
+            "RichText/Html": (self._process_regular_message, 'messages'),
+        }
 
     def _initialize_artifact_types(self, bb):
         """Initialize all custom artifact types for Teams data."""
@@ -139,6 +521,13 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         self.art_contacts = bb.getOrAddArtifactType("TSK_TEAMS_CONTACTS", ARTIFACT_PREFIX + " Contacts")
         self.art_mention = bb.getOrAddArtifactType("TSK_TEAMS_MENTION", ARTIFACT_PREFIX + " Mentions")
         self.art_reaction = bb.getOrAddArtifactType("TSK_TEAMS_REACTION", ARTIFACT_PREFIX + " Reactions")
+        
+        # Thread ID suffix of each conversation artifact type
+        self._thread_suffixes = [
+            ("@thread.v2", self.art_group_chat),
+            ("@unq.gbl.spaces", self.art_private_chat),
+            ("@thread.tacv2", self.art_teams_chat),
+        ]
 
     def _initialize_attribute_types(self, bb):
         """Initialize all custom attribute types for Teams artifacts."""
@@ -153,6 +542,15 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         self._init_call_attributes(bb)
         self._init_mention_attributes(bb)
         self._init_contact_attributes(bb)
+        self._init_extra_attribute_types(bb)
+
+        # Bind the attribute types used on every artifact to instance fields
+        self._bind_attribute_types()
+
+    def _bind_attribute_types(self):
+        """Bind each attribute type to a field, e.g. TSK_TEAMS_MSG_ID to self._a_msg_id."""
+        for name, attr_type in self.attr.items():
+            setattr(self, "_a_" + name[len("TSK_TEAMS_"):].lower(), attr_type)
 
     def _init_member_attributes(self, bb):
         """Initialize attributes for conversation members."""
@@ -278,6 +676,38 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         for name, vtype, desc in contact_attributes:
             self.attr[name] = bb.getOrAddAttributeType(name, vtype, desc)
 
+    def _init_extra_attribute_types(self, bb):
+        """Initialize the additional attributes of call logs and meetings."""
+        self.attr_calllog_extras = {}
+        calllog_attributes = [
+            ("TSK_TEAMS_CALLLOG_STARTTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Start Time"),
+            ("TSK_TEAMS_CALLLOG_ENDTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "End Time"),
+            ("TSK_TEAMS_CALLLOG_DURATION_CALC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Duration (hh:mm:ss)"),
+            ("TSK_TEAMS_CALLLOG_DIRECTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Direction"),
+            ("TSK_TEAMS_CALLLOG_CALLTYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Type"),
+            ("TSK_TEAMS_CALLLOG_STATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "State"),
+            ("TSK_TEAMS_CALLLOG_CALLID2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call ID"),
+            ("TSK_TEAMS_CALLLOG_ORIGINATOR", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Originator"),
+            ("TSK_TEAMS_CALLLOG_TARGET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Target Participant"),
+            ("TSK_TEAMS_CALLLOG_PARTICIPANTS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Participants List"),
+            ("TSK_TEAMS_CALLLOG_PARTICIPANT_LIST", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Participants List (json)"),
+        ]
+        
+        for name, vtype, desc in calllog_attributes:
+            self.attr_calllog_extras[name] = bb.getOrAddAttributeType(name, vtype, desc)
+        
+        self.attr_eventcall_extras = {}
+        eventcall_attributes = [
+            ("TSK_TEAMS_EVENTCALL_PARTICIPANTS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Participants"),
+            ("TSK_TEAMS_EVENTCALL_ORGANIZERUPN", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Organizer Email"),
+            ("TSK_TEAMS_EVENTCALL_MEETINGTYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Type"),
+            ("TSK_TEAMS_EVENTCALL_STARTTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Start Time"),
+            ("TSK_TEAMS_EVENTCALL_ENDTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting End Time"),
+        ]
+        
+        for name, vtype, desc in eventcall_attributes:
+            self.attr_eventcall_extras[name] = bb.getOrAddAttributeType(name, vtype, desc)
+
     def process(self, dataSource, progressBar):
         """
         Main processing method that handles Teams JSON files.
@@ -312,14 +742,13 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         peopleFiles = []
         otherFiles = []
         
+        # Files are dispatched to their list by name, anything else is "other"
+        buckets = {
+            "output_conversations.json": conversationFiles,
+            "output_people.json": peopleFiles,
+        }
         for jsonFile in jsonFiles:
-            filename = jsonFile.getName()
-            if filename == "output_conversations.json":
-                conversationFiles.append(jsonFile)
-            elif filename == "output_people.json":
-                peopleFiles.append(jsonFile)
-            else:
-                otherFiles.append(jsonFile)
+            buckets.get(jsonFile.getName(), otherFiles).append(jsonFile)
                 
         return conversationFiles, peopleFiles, otherFiles
 
@@ -347,36 +776,79 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
                 return IngestModule.ProcessResult.OK
             self._process_single_file(jsonFile)
         
-        # Process remaining files
+        # Process remaining files. They only read the contact and tenant maps
+        # filled above, so the smaller ones are processed in parallel; large
+        # files go first, one at a time, to bound the memory in use.
+        smallFiles = []
         for jsonFile in otherFiles:
+            if jsonFile.getSize() <= PARALLEL_MAX_SIZE:
+                smallFiles.append(jsonFile)
+                continue
             if self.context.isJobCancelled():
                 return IngestModule.ProcessResult.OK
             self._process_single_file(jsonFile)
         
+        if len(smallFiles) < 2:
+            for jsonFile in smallFiles:
+                if self.context.isJobCancelled():
+                    return IngestModule.ProcessResult.OK
+                self._process_single_file(jsonFile)
+            return IngestModule.ProcessResult.OK
+        
+        threads = min(len(smallFiles), PARALLEL_MAX_THREADS,
+                      Runtime.getRuntime().availableProcessors())
+        executor = Executors.newFixedThreadPool(threads)
+        try:
+            futures = []
+            for jsonFile in smallFiles:
+                if self.context.isJobCancelled():
+                    break
+                futures.append((jsonFile, executor.submit(_ProcessFileTask(self, jsonFile))))
+            for jsonFile, future in futures:
+                # A failure in one file, e.g. a Java exception while
+                # extracting it, must not stop the remaining files
+                try:
+                    future.get()
+                except Exception as e:
+                    self._handle_parsing_error(jsonFile.getName(), e)
+        finally:
+            executor.shutdown()
+        
         return IngestModule.ProcessResult.OK
 
     def _process_single_file(self, jsonFile):
         """
-        Process a single JSON file by extracting it to temp directory and parsing.
+        Process a single JSON file, reading it into memory or extracting it to
+        the temp directory, and parsing it.
         
         Args:
             jsonFile: The JSON file object to process
         """
-        tmpDir = Case.getCurrentCase().getTempDirectory()
-        localJSON = os.path.join(tmpDir, jsonFile.getName())
+        size = jsonFile.getSize()
+        if size <= IN_MEMORY_MAX_SIZE:
+            buf = jarray.zeros(size, "b")
+            if jsonFile.read(buf, 0, size) == size:
+                self._parse_json(None, jsonFile, buf)
+                return
+        
+        # Files are extracted in parallel and may share a name, so the local
+        # copy is prefixed with the unique file ID
+        localJSON = os.path.join(self._tmp_dir, "{}_{}".format(jsonFile.getId(), jsonFile.getName()))
         ContentUtils.writeToFile(jsonFile, File(localJSON))
         self._parse_json(localJSON, jsonFile)
 
-    def _parse_json(self, json_path, jsonFile):
+    def _parse_json(self, json_path, jsonFile, buf=None):
         """
         Parse a JSON file and create appropriate artifacts based on file type.
         
         Args:
-            json_path: Local path to the JSON file
+            json_path: Local path to the JSON file, unused when buf is given
             jsonFile: Original file object from Autopsy
+            buf: Contents of the file as a Java byte array, if already read
         """
-        bb = Case.getCurrentCase().getServices().getBlackboard()
-        basename = os.path.basename(json_path)
+        bb = self._bb
+        basename = jsonFile.getName()
+        self._staging.artifacts = []
         
         # Initialize counters for different artifact types
         counters = {
@@ -390,23 +862,29 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         try:
             # Load and parse JSON data
-            with codecs.open(json_path, "r", "utf-8") as f:
-                records = json.load(f)
+            if buf is not None:
+                records = _load_buffer_records(buf)
+            else:
+                records = _load_records(json_path)
             
             # Process based on file type
-            if basename == "output_conversations.json":
-                counters['threads'] = self._process_conversations(records, jsonFile, bb)
-            elif basename == "output_people.json":
-                counters['contacts'] = self._process_people(records, jsonFile, bb)
-            else:
-                # Process other JSON files (messages, calls, etc.)
-                counters = self._process_message_data(records, jsonFile, bb)
+            try:
+                if basename == "output_conversations.json":
+                    counters['threads'] = self._process_conversations(records, jsonFile, bb)
+                elif basename == "output_people.json":
+                    counters['contacts'] = self._process_people(records, jsonFile, bb)
+                else:
+                    # Process other JSON files (messages, calls, etc.)
+                    counters = self._process_message_data(records, jsonFile, bb)
+            finally:
+                # Index the artifacts created so far, even if processing failed
+                self._post_staged_artifacts(bb)
             
             # Post processing results message
             self._post_processing_message(basename, counters)
                     
         except Exception as e:
-            self._handle_parsing_error(json_path, e)
+            self._handle_parsing_error(basename, e)
 
     def _process_conversations(self, records, jsonFile, bb):
         """
@@ -422,6 +900,11 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         """
         total_threads = 0
         
+        # Bind per-record attribute lookups to locals once for the whole loop
+        ctm = self.conversation_tenant_map
+        new_art = jsonFile.newArtifact
+        stage = self._staging.artifacts.append
+        
         for rec in records:
             value_obj = rec.get("value", {})
             tenantId = rec.get("tenant_id", None)
@@ -430,13 +913,13 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
                 thread_val = value_obj["value"]
                 
                 # Extract thread data safely
-                threadId = self._safe_string_extract(thread_val.get("id"))
-                threadType = self._safe_string_extract(thread_val.get("type"))
-                teamId = self._safe_string_extract(thread_val.get("teamId"))
+                threadId = _safe_string_extract(thread_val.get("id"))
+                threadType = _safe_string_extract(thread_val.get("type"))
+                teamId = _safe_string_extract(thread_val.get("teamId"))
                 
                 # Store tenant mapping for this conversation
                 if threadId and tenantId:
-                    self.conversation_tenant_map[threadId] = tenantId
+                    ctm[threadId] = tenantId
                 
                 # Process thread properties
                 thread_data = self._extract_thread_data(thread_val)
@@ -445,9 +928,9 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
                 artifact_type = self._determine_thread_artifact_type(threadId)
                 
                 # Create and populate artifact
-                art = jsonFile.newArtifact(artifact_type.getTypeID())
+                art = new_art(artifact_type.getTypeID())
                 self._populate_thread_artifact(art, threadId, threadType, teamId, tenantId, thread_data)
-                bb.indexArtifact(art)
+                stage(art)
                 total_threads += 1
                 
                 # Extract and create member artifacts
@@ -471,6 +954,12 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         """
         total_contacts = 0
         
+        # Bind per-record attribute lookups to locals once for the whole loop
+        cmap = self.contacts_map
+        new_art = jsonFile.newArtifact
+        contacts_type_id = self.art_contacts.getTypeID()
+        stage = self._staging.artifacts.append
+        
         for rec in records:
             if isinstance(rec, dict) and "value" in rec:
                 value_obj = rec.get("value", {})
@@ -482,16 +971,27 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
                     mri = contact_data.get("mri", "")
                     displayName = contact_data.get("displayName", "")
                     
-                    # Store in contacts map for name enrichment
+                    # Store in contacts map for name enrichment. MRIs are interned
+                    # since they are looked up for every message; only ASCII
+                    # strings can be interned under Jython.
                     if mri and displayName:
-                        self.contacts_map[mri] = displayName
+                        if isinstance(mri, basestring):
+                            try:
+                                mri = intern(str(mri))
+                            except UnicodeError:
+                                pass
+                        cmap[mri] = displayName
                     
                     # Create contact artifact
-                    art = jsonFile.newArtifact(self.art_contacts.getTypeID())
+                    art = new_art(contacts_type_id)
                     self._populate_contact_artifact(art, contact_data)
-                    bb.indexArtifact(art)
+                    stage(art)
                     total_contacts += 1
         
+        # Contact names and enriched IDs found so far may not hold for the
+        # new contacts
+        self._contact_name_cache.clear()
+        self._enriched_creator_cache.clear()
         return total_contacts
 
     def _process_message_data(self, records, jsonFile, bb):
@@ -513,71 +1013,73 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             'meetings': 0
         }
         
+        # Bind per-record attribute lookups to locals once for the whole loop
+        is_cancelled = self.context.isJobCancelled
+        process_message = self._process_single_message
+        staged = self._staging.artifacts
+        tenant_ids = self.conversation_tenant_map
+        
         for rec in records:
-            if self.context.isJobCancelled():
+            if is_cancelled():
                 break
                 
-            value_obj = rec.get("value", {})
-            if not isinstance(value_obj, dict):
-                continue
-                
-            main_value = value_obj.get("value", {})
-            if not isinstance(main_value, dict):
+            # Records are well formed almost always, so malformed ones (missing
+            # keys, or values that are not objects) are skipped on the error path
+            try:
+                main_value = rec["value"]["value"]
+                conversation_id = main_value["conversationId"]
+                messages = _itervalues(main_value["messageMap"])
+            except (KeyError, TypeError, AttributeError):
                 continue
-                
-            conversation_id = main_value.get("conversationId")
-            message_map = main_value.get("messageMap", {})
             
-            if not conversation_id or not isinstance(message_map, dict):
+            if not conversation_id:
                 continue
             
+            # All the messages of a record belong to the same conversation
+            tenant_id = tenant_ids.get(conversation_id, "")
+            
             # Process each message in the message map
-            for msg in message_map.values():
-                msg_counters = self._process_single_message(msg, conversation_id, jsonFile, bb)
-                for key, value in msg_counters.items():
-                    counters[key] += value
+            for msg in messages:
+                process_message(msg, conversation_id, tenant_id, jsonFile, bb, counters)
+                if len(staged) >= POST_BATCH_SIZE:
+                    self._post_staged_artifacts(bb)
         
         return counters
 
-    def _process_single_message(self, msg, conversation_id, jsonFile, bb):
+    def _process_single_message(self, msg, conversation_id, tenant_id, jsonFile, bb, counters):
         """
         Process a single message and create appropriate artifacts.
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation this message belongs to
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
-            
-        Returns:
-            dict: Counters for artifacts created
+            counters: Counters of the file, updated with the artifacts created
         """
-        counters = {'messages': 0, 'calls_conv': 0, 'calls_msg': 0, 'meetings': 0}
-        
         msg_type = msg.get("messageType", "")
         
         # Handle different message types
         if conversation_id == "48:calllogs":
-            counters['calls_conv'] += self._process_call_log(msg, conversation_id, jsonFile, bb)
-        elif msg_type in ["RichText/Media_CallRecording", "RichText/Media_CallTranscript"]:
-            counters['calls_msg'] += self._process_call_activity(msg, conversation_id, jsonFile, bb)
-        elif msg_type == "Event/Call":
-            counters['meetings'] += self._process_meeting_event(msg, conversation_id, jsonFile, bb)
-        elif msg_type in ["Text", "RichText/Html"]:
-            counters['messages'] += self._process_regular_message(msg, conversation_id, jsonFile, bb)
+            counters['calls_conv'] += self._process_call_log(msg, conversation_id, tenant_id, jsonFile, bb)
+        else:
+            handler = self._msg_handlers.get(msg_type)
+            if handler is not None:
+                process, counter = handler
+                counters[counter] += process(msg, conversation_id, tenant_id, jsonFile, bb)
         
         # Always process reactions and mentions regardless of message type
-        self._process_message_reactions(msg, conversation_id, jsonFile, bb)
-        
-        return counters
+        self._process_message_reactions(msg, conversation_id, tenant_id, jsonFile, bb)
 
-    def _process_regular_message(self, msg, conversation_id, jsonFile, bb):
+    def _process_regular_message(self, msg, conversation_id, tenant_id, jsonFile, bb):
         """
         Process a regular text or HTML message.
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
             
@@ -585,21 +1087,15 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             int: Number of messages processed (0 or 1)
         """
         # Extract message data
-        seq_id = msg.get("sequenceId")
-        content = msg.get("content", "")
-        msg_id = msg.get("id")
-        creator = msg.get("creator")
-        display_name = msg.get("imDisplayName")
-        msg_type = msg.get("messageType")
-        orig_arrival = msg.get("originalArrivalTime")
+        seq_id, content, msg_id, creator, display_name, msg_type, orig_arrival = map(msg.get, MESSAGE_FIELDS)
         properties = msg.get("properties", {})
         
         # Convert to safe unicode strings
-        content = self._safe_unicode(content)
-        msg_id = self._safe_unicode(msg_id)
-        creator = self._safe_unicode(creator)
-        display_name = self._safe_unicode(display_name)
-        msg_type = self._safe_unicode(msg_type)
+        content = _safe_unicode(content)
+        msg_id = _safe_unicode(msg_id)
+        creator = _safe_unicode(creator)
+        display_name = _safe_unicode(display_name)
+        msg_type = self._message_type_text(msg_type)
         
         # Process HTML content if needed
         if msg_type == "RichText/Html":
@@ -607,7 +1103,7 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             
             # Check for AMSImage content and create attachment if found
             if self._has_ams_image_content(content):
-                self._create_ams_image_attachment(content, conversation_id, msg_id, jsonFile, bb)
+                self._create_ams_image_attachment(content, conversation_id, msg_id, tenant_id, jsonFile, bb)
         
         # Handle empty content
         if not content and isinstance(properties, dict) and "files" in properties:
@@ -635,42 +1131,41 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         # Determine if message has attachments
         has_attachment = "yes" if link_urls or file_min or self._has_blur_hash(properties) else "no"
         
-        # Get tenant ID for this conversation
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
-        
         # Enrich creator with contact name if available
         enriched_creator = self._enrich_creator_with_name(creator) if creator else ""
         
         # Create message artifact
         art = jsonFile.newArtifact(self.art_msg.getTypeID())
         
-        # Populate message attributes
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONV_ID"], ARTIFACT_PREFIX, conversation_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_SEQ_ID"], ARTIFACT_PREFIX, str(seq_id)))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CREATOR"], ARTIFACT_PREFIX, enriched_creator))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_DISPLAY_NAME"], ARTIFACT_PREFIX, display_name if display_name else ""))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTENT"], ARTIFACT_PREFIX, content))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_TYPE"], ARTIFACT_PREFIX, msg_type))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_HAS_ATTACHMENT"], ARTIFACT_PREFIX, has_attachment))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_PROPERTIES"], ARTIFACT_PREFIX, properties_json))
+        # Populate message attributes; they are handed over in a single call
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_conv_id, ARTIFACT_PREFIX, conversation_id))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
+        attrs.add(BlackboardAttribute(self._a_seq_id, ARTIFACT_PREFIX, str(seq_id)))
+        attrs.add(BlackboardAttribute(self._a_creator, ARTIFACT_PREFIX, enriched_creator))
+        attrs.add(BlackboardAttribute(self._a_display_name, ARTIFACT_PREFIX, display_name if display_name else ""))
+        attrs.add(BlackboardAttribute(self._a_content, ARTIFACT_PREFIX, content))
+        attrs.add(BlackboardAttribute(self._a_msg_type, ARTIFACT_PREFIX, msg_type))
+        attrs.add(BlackboardAttribute(self._a_has_attachment, ARTIFACT_PREFIX, has_attachment))
+        attrs.add(BlackboardAttribute(self._a_properties, ARTIFACT_PREFIX, properties_json))
         
         # Add timestamps
         if orig_arrival_ts:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ORIG_ARRIVAL"], ARTIFACT_PREFIX, orig_arrival_ts))
+            attrs.add(BlackboardAttribute(self._a_orig_arrival, ARTIFACT_PREFIX, orig_arrival_ts))
         if client_arrival_ts:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CLIENT_ARRIVAL"], ARTIFACT_PREFIX, client_arrival_ts))
+            attrs.add(BlackboardAttribute(self._a_client_arrival, ARTIFACT_PREFIX, client_arrival_ts))
         if edit_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_EDIT_TIME"], ARTIFACT_PREFIX, edit_time_val))
+            attrs.add(BlackboardAttribute(self._a_edit_time, ARTIFACT_PREFIX, edit_time_val))
         if compose_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_COMPOSE_TIME"], ARTIFACT_PREFIX, compose_time_val))
+            attrs.add(BlackboardAttribute(self._a_compose_time, ARTIFACT_PREFIX, compose_time_val))
         if delete_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_DELETE_TIME"], ARTIFACT_PREFIX, delete_time_val))
+            attrs.add(BlackboardAttribute(self._a_delete_time, ARTIFACT_PREFIX, delete_time_val))
         if draft_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_DRAFT_TIME"], ARTIFACT_PREFIX, draft_time_val))
+            attrs.add(BlackboardAttribute(self._a_draft_time, ARTIFACT_PREFIX, draft_time_val))
+        art.addAttributes(attrs)
         
-        bb.indexArtifact(art)
+        self._staging.artifacts.append(art)
         
         # Create attachment artifacts
         for url in link_urls:
@@ -690,29 +1185,6 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
 
     # Utility methods for data processing
     
-    def _safe_string_extract(self, val):
-        """Safely extract string value from potentially mixed data types."""
-        if val is None:
-            return ""
-        if isinstance(val, basestring):
-            return val.strip()
-        if isinstance(val, dict):
-            return ""
-        return unicode(val)
-
-    def _safe_unicode(self, val):
-        """Safely convert value to unicode string."""
-        if val is None:
-            return u""
-        if isinstance(val, unicode):
-            return val
-        if isinstance(val, str):
-            try:
-                return val.decode('utf-8')
-            except UnicodeDecodeError:
-                return val.decode('utf-8', 'replace')
-        return unicode(val)
-
     def _convert_timestamp(self, val, for_datetime_attr=True):
         """
         Convert timestamp to appropriate format.
@@ -728,53 +1200,33 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         if not val:
             return None if for_datetime_attr else u""
         
+        # Many messages share timestamps, e.g. the arrival and compose times
+        # of a message, or messages imported together. The value's class is
+        # part of the key since e.g. 1 and 1.0 are equal keys.
+        key = (val.__class__, val, for_datetime_attr)
+        cache = self._ts_cache
         try:
-            # Handle ISO8601 strings
-            if isinstance(val, basestring) and ("T" in val and ("-" in val or ":" in val)):
-                val_clean = val.rstrip("Z")  # Remove trailing Z if present
-                try:
-                    # Try with microseconds first
-                    if "." in val_clean:
-                        dt = datetime.strptime(val_clean[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                    else:
-                        dt = datetime.strptime(val_clean[:19], "%Y-%m-%dT%H:%M:%S")
-                    
-                    if for_datetime_attr:
-                        return calendar.timegm(dt.timetuple())  # Numeric timestamp
-                    else:
-                        return dt.strftime("%Y-%m-%d %H:%M:%S")  # Formatted string
-                except Exception:
-                    # Fallback for string format
-                    if not for_datetime_attr:
-                        return val_clean[:19].replace("T", " ")
-                    return None
-            
-            # Handle numeric timestamps
-            v = float(val)
-            if v > 9999999999:
-                v = v / 1000.0
-            
-            if for_datetime_attr:
-                return int(v)  # Numeric timestamp
-            else:
-                dt = datetime.utcfromtimestamp(v)
-                return dt.strftime("%Y-%m-%d %H:%M:%S")  # Formatted string
-                
-        except Exception:
-            if for_datetime_attr:
-                return None
-            else:
-                return unicode(val) if val else u""
+            return cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable values, e.g. lists, are converted without caching
+            return _timestamp_value(val, for_datetime_attr)
+        
+        result = _timestamp_value(val, for_datetime_attr)
+        if len(cache) >= TIMESTAMP_CACHE_SIZE:
+            cache.clear()
+        cache[key] = result
+        return result
 
     def _has_ams_image_content(self, content):
         """Check if content contains AMSImage indicators."""
         if not content:
             return False
-        return "AMSImage" in content or "amsimage" in content.lower()
+        return _RE_AMSIMAGE.search(content) is not None
 
-    def _create_ams_image_attachment(self, content, conversation_id, msg_id, jsonFile, bb):
+    def _create_ams_image_attachment(self, content, conversation_id, msg_id, tenant_id, jsonFile, bb):
         """Create attachment artifact for AMSImage content."""
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
         self._make_attachment(bb, jsonFile, conversation_id, msg_id, "", 
                             "AMSImage", "image", tenant_id)
 
@@ -791,15 +1243,11 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
     def _extract_file_names_as_content(self, files_data):
         """Extract file names from files data to use as content."""
         files_list = self._safe_json_list(files_data)
-        if files_list:
-            file_names = []
-            for f in files_list:
-                if isinstance(f, dict):
-                    name = f.get("fileName", f.get("title", ""))
-                    if name:
-                        file_names.append(name)
-            return " | ".join(file_names) if file_names else ""
-        return ""
+        # The title is only a fallback for a missing fileName key, not for an
+        # empty one
+        names = (f["fileName"] if "fileName" in f else f.get("title", "")
+                 for f in files_list if isinstance(f, dict))
+        return " | ".join(name for name in names if name)
 
     def _extract_timestamp_from_properties(self, properties, timestamp_key):
         """Extract and convert timestamp from properties dictionary."""
@@ -807,10 +1255,21 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             return self._convert_timestamp(properties[timestamp_key], for_datetime_attr=True)
         return None
 
+    def _message_type_text(self, msg_type):
+        """
+        Convert a message type to unicode. Only the few types in _msg_handlers
+        get here, so each is converted once and the result shared.
+        """
+        text = self._msg_type_text.get(msg_type)
+        if text is None:
+            text = _safe_unicode(msg_type)
+            self._msg_type_text[msg_type] = text
+        return text
+
     def _serialize_properties(self, properties):
         """Serialize properties dictionary to JSON string."""
         try:
-            return json.dumps(properties, ensure_ascii=False, separators=(',', ':'))
+            return _compact_json(properties)
         except Exception:
             return "{}"
 
@@ -835,161 +1294,183 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         mention_min = []
         
-        # Group mentions by MRI to handle split names
-        mention_groups = {}
+        # Group the display name parts of mentions by MRI to handle split
+        # names; the mention type is taken from the first part
+        parts_by_mri = {}
+        type_by_mri = {}
         for m in mentions:
             if isinstance(m, dict):
                 mri = m.get("mri", "")
-                mention_type = m.get("mentionType", "")
-                display_name = m.get("displayName", "")
-                
                 if mri:  # Only process if MRI exists
-                    if mri not in mention_groups:
-                        mention_groups[mri] = {
-                            "mri": mri,
-                            "mentionType": mention_type,
-                            "displayName_parts": []
-                        }
-                    mention_groups[mri]["displayName_parts"].append(display_name)
+                    name_parts = parts_by_mri.get(mri)
+                    if name_parts is None:
+                        name_parts = parts_by_mri[mri] = []
+                        type_by_mri[mri] = m.get("mentionType", "")
+                    # A null display name is skipped like a missing one
+                    part = (m.get("displayName") or "").strip()
+                    if part:
+                        name_parts.append(part)
         
         # Reconstruct full names by joining display name parts
-        for mri, group in mention_groups.items():
-            name_parts = [part.strip() for part in group["displayName_parts"] if part.strip()]
+        for mri, name_parts in parts_by_mri.items():
             if name_parts:
-                full_name = " ".join(name_parts)
-                full_name = full_name.replace(" ,", ",").replace("( ", "(").replace(" )", ")")
-                
                 mention_min.append({
-                    "mri": group["mri"],
-                    "mentionType": group["mentionType"],
-                    "displayName": full_name
+                    "mri": mri,
+                    "mentionType": type_by_mri[mri],
+                    "displayName": _RE_PUNCT_FIX.sub(_punct_fix_repl, " ".join(name_parts))
                 })
         
         return link_urls, file_min, mention_min
 
     def _safe_json_list(self, value):
-        """Safe JSON list parser."""
+        """
+        Safe JSON list parser. Parsed lists may be shared between calls and
+        must not be modified.
+        """
         if not value:
             return []
         if isinstance(value, list):
             return value
         if isinstance(value, basestring):
+            # The same short lists, e.g. of files or mentions, are repeated
+            # across replies and forwards
+            cacheable = len(value) <= JSON_LIST_CACHE_MAX_LENGTH
+            if cacheable:
+                cached = self._json_list_cache.get(value)
+                if cached is not None:
+                    return cached
             try:
                 parsed = json.loads(value)
-                return parsed if isinstance(parsed, list) else []
+                result = parsed if isinstance(parsed, list) else []
             except Exception:
-                return []
+                result = []
+            if cacheable:
+                cache = self._json_list_cache
+                if len(cache) >= JSON_LIST_CACHE_SIZE:
+                    cache.clear()
+                cache[value] = result
+            return result
         return []
 
     def _make_attachment(self, bb, jsonFile, conv_id, msg_id, url, name, ftype, tenant_id=""):
         """Create attachment artifact."""
         art = jsonFile.newArtifact(self.art_att.getTypeID())
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONV_ID"], ARTIFACT_PREFIX, conv_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_conv_id, ARTIFACT_PREFIX, conv_id))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
         if url:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ATT_URL"], ARTIFACT_PREFIX, url))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ATT_NAME"], ARTIFACT_PREFIX, name))
+            attrs.add(BlackboardAttribute(self._a_att_url, ARTIFACT_PREFIX, url))
+        attrs.add(BlackboardAttribute(self._a_att_name, ARTIFACT_PREFIX, name))
         if ftype:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ATT_TYPE"], ARTIFACT_PREFIX, ftype))
-        bb.indexArtifact(art)
+            attrs.add(BlackboardAttribute(self._a_att_type, ARTIFACT_PREFIX, ftype))
+        art.addAttributes(attrs)
+        self._staging.artifacts.append(art)
 
     def _make_mention(self, bb, jsonFile, conv_id, msg_id, mri, mention_type, display_name, tenant_id=""):
         """Create mention artifact."""
         art = jsonFile.newArtifact(self.art_mention.getTypeID())
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MENTION_CONV_ID"], ARTIFACT_PREFIX, conv_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MENTION_MRI"], ARTIFACT_PREFIX, mri))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MENTION_TYPE"], ARTIFACT_PREFIX, mention_type))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MENTION_DISPLAYNAME"], ARTIFACT_PREFIX, display_name))
-        bb.indexArtifact(art)
-
-    def _unescape_html(self, text):
-        """Unescape HTML entities."""
-        if not text:
-            return ""
-        text = text.replace("&amp;", "&")
-        text = text.replace("&lt;", "<")
-        text = text.replace("&gt;", ">")
-        text = text.replace("&quot;", "\"")
-        text = text.replace("&#39;", "'")
-        return text
-
-    def _clean_html(self, html_str, properties=None):
-        """Clean HTML content and extract relevant information."""
-        try:
-            unichr_fn = unichr
-        except NameError:
-            unichr_fn = chr
-            
-        def bold_unicode(text):
-            """Convert text to bold unicode characters."""
-            bold_map = {}
-            for i in range(26):
-                bold_map[chr(ord('A')+i)] = unichr_fn(0x1D400 + i)
-            for i in range(26):
-                bold_map[chr(ord('a')+i)] = unichr_fn(0x1D41A + i)
-            for i in range(10):
-                bold_map[chr(ord('0')+i)] = unichr_fn(0x1D7CE + i)
-            return u''.join(bold_map.get(c, c) for c in text)
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_mention_conv_id, ARTIFACT_PREFIX, conv_id))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
+        attrs.add(BlackboardAttribute(self._a_mention_mri, ARTIFACT_PREFIX, mri))
+        attrs.add(BlackboardAttribute(self._a_mention_type, ARTIFACT_PREFIX, mention_type))
+        attrs.add(BlackboardAttribute(self._a_mention_displayname, ARTIFACT_PREFIX, display_name))
+        art.addAttributes(attrs)
+        self._staging.artifacts.append(art)
+
+    def _clean_html(self, html_str, properties=None, allow_bq=True):
+        """
+        Clean HTML content and extract relevant information.
         
+        allow_bq=False skips the reply and forward blockquote handling, for
+        content known not to contain a closing blockquote tag. It does not
+        change the result, so it is not part of the cache key.
+        """
+        # Quoted replies, forwards and notifications repeat the same bodies
+        # across many messages. Only the forward context is read from the
+        # properties, so it is the only part of them in the key.
+        ctx_key = None
+        if properties and isinstance(properties, dict):
+            ctx = properties.get("originalMessageContext")
+            if ctx and isinstance(ctx, dict):
+                sender = ctx.get("sender", "")
+                orig_time = ctx.get("clientArrivalTime", "")
+                ctx_key = (sender.__class__, sender, orig_time.__class__, orig_time)
+        key = (html_str, ctx_key)
+        cache = self._clean_html_cache
+        try:
+            result = cache.get(key)
+        except TypeError:
+            # Unhashable context values are not cached
+            return self._clean_html_uncached(html_str, properties, allow_bq)
+        if result is None:
+            result = self._clean_html_uncached(html_str, properties, allow_bq)
+            if len(cache) >= CLEAN_HTML_CACHE_SIZE:
+                cache.clear()
+            cache[key] = result
+        return result
+
+    def _clean_html_uncached(self, html_str, properties, allow_bq):
+        """Clean HTML content, without going through the cache."""
         if not html_str:
             return u""
         
+        # Plain text has no links or blockquotes to handle, only text cleanup
+        if "<" not in html_str:
+            return self._clean_text(html_str)
+        
         # Handle simple link cases
-        link_match = re.match(r'\s*<p>?\s*<a [^>]*href="([^"]+)"[^>]*>[^<]+</a>\s*</p>?\s*$', 
-                             html_str.strip(), re.IGNORECASE)
+        stripped = html_str.strip()
+        link_match = _RE_LINK_ONLY_P.match(stripped)
         if not link_match:
-            link_match = re.match(r'\s*<a [^>]*href="([^"]+)"[^>]*>[^<]+</a>\s*$', 
-                                 html_str.strip(), re.IGNORECASE)
+            link_match = _RE_LINK_ONLY.match(stripped)
         if link_match:
             return link_match.group(1)
         
-        # Process blockquotes for replies and forwards
-        blockquote_reply = re.search(
-            r'<blockquote[^>]*?(?:itemscope[^>]*?)?itemtype="http://schema.skype.com/Reply"[^>]*>([\s\S]*?)</blockquote>', 
-            html_str, re.IGNORECASE)
-        blockquote_forward = re.search(
-            r'<blockquote[^>]*?(?:itemscope[^>]*?)?itemtype="http://schema.skype.com/Forward"[^>]*>([\s\S]*?)</blockquote>', 
-            html_str, re.IGNORECASE)
-        
-        if blockquote_reply or blockquote_forward:
+        # Process blockquotes for replies and forwards. Most messages have
+        # none, so the regexes only run when the tag name is present.
+        if allow_bq and "<blockquote" in html_str.lower():
+            blockquote_reply = _RE_BLOCKQUOTE_REPLY.search(html_str)
             if blockquote_reply:
-                return self._process_reply_blockquote(blockquote_reply, html_str, bold_unicode)
-            elif blockquote_forward:
-                return self._process_forward_blockquote(blockquote_forward, html_str, bold_unicode, properties)
+                return self._process_reply_blockquote(blockquote_reply, html_str)
+            blockquote_forward = _RE_BLOCKQUOTE_FORWARD.search(html_str)
+            if blockquote_forward:
+                return self._process_forward_blockquote(blockquote_forward, html_str, properties)
         
         # Process regular HTML content
         return self._process_regular_html(html_str)
 
-    def _process_reply_blockquote(self, blockquote_match, html_str, bold_unicode):
+    def _process_reply_blockquote(self, blockquote_match, html_str):
         """Process reply blockquote content."""
         quoted_html = blockquote_match.group(1)
         before_blockquote = html_str[:blockquote_match.start()].strip()
         after_blockquote = html_str[blockquote_match.end():]
         
-        sender_match = re.search(r'<strong[^>]*>([^<]+)</strong>', quoted_html, re.IGNORECASE)
+        sender_match = _RE_STRONG.search(quoted_html)
         sender = sender_match.group(1).strip() if sender_match else None
         
-        quoted_no_sender = re.sub(r'<strong[^>]*>[^<]+</strong>', '', quoted_html, flags=re.IGNORECASE)
-        quoted = self._clean_html(quoted_no_sender)
+        # The quoted part ends at the first closing blockquote tag, so it holds
+        # no nested reply or forward unless removing the sender made one
+        quoted_no_sender, removed = _RE_STRONG.subn('', quoted_html)
+        quoted = self._clean_html(quoted_no_sender, allow_bq=removed > 0)
         reply = self._clean_html(after_blockquote)
         
         if sender:
-            span_id_match = re.search(r'<span[^>]*itemid\s*=\s*"([^"]+)"', quoted_html, re.IGNORECASE)
+            span_id_match = _RE_SPAN_ITEMID.search(quoted_html)
             itemid = span_id_match.group(1) if span_id_match else None
             
             if itemid:
                 contact_name = self._get_contact_name_by_id(itemid)
                 if contact_name:
-                    result = bold_unicode(u"In reply to {} ({}):".format(sender, contact_name)) + " " + quoted.strip() + u"\n\n" + reply.strip()
+                    result = _bold_unicode(u"In reply to {} ({}):".format(sender, contact_name)) + " " + quoted.strip() + u"\n\n" + reply.strip()
                 else:
-                    result = bold_unicode(u"In reply to {}:".format(sender)) + " " + quoted.strip() + u"\n\n" + reply.strip()
+                    result = _bold_unicode(u"In reply to {}:".format(sender)) + " " + quoted.strip() + u"\n\n" + reply.strip()
             else:
-                result = bold_unicode(u"In reply to {}:".format(sender)) + " " + quoted.strip() + u"\n\n" + reply.strip()
+                result = _bold_unicode(u"In reply to {}:".format(sender)) + " " + quoted.strip() + u"\n\n" + reply.strip()
         else:
-            result = bold_unicode(u"In reply to message") + ": " + quoted.strip() + u"\n\n" + reply.strip()
+            result = _bold_unicode(u"In reply to message") + ": " + quoted.strip() + u"\n\n" + reply.strip()
         
         # Add content before blockquote if present
         if before_blockquote:
@@ -998,13 +1479,15 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             
         return result.strip()
 
-    def _process_forward_blockquote(self, blockquote_match, html_str, bold_unicode, properties):
+    def _process_forward_blockquote(self, blockquote_match, html_str, properties):
         """Process forward blockquote content."""
         quoted_html = blockquote_match.group(1)
         before_blockquote = html_str[:blockquote_match.start()].strip()
         after_blockquote = html_str[blockquote_match.end():]
         
-        quoted = self._clean_html(quoted_html)
+        # The quoted part ends at the first closing blockquote tag, so it holds
+        # no nested reply or forward
+        quoted = self._clean_html(quoted_html, allow_bq=False)
         reply = self._clean_html(after_blockquote)
         
         # Extract info from originalMessageContext if available
@@ -1018,7 +1501,7 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
                     time_str = self._convert_timestamp(orig_time, for_datetime_attr=False) if orig_time else ""
                     info = u"Original: {} {}".format(orig_sender, time_str).strip() + u"\n"
         
-        result = info + bold_unicode(u"Forwarded message:") + " " + quoted.strip()
+        result = info + _bold_unicode(u"Forwarded message:") + " " + quoted.strip()
         
         # Add content before blockquote if present
         if before_blockquote:
@@ -1033,31 +1516,15 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
     def _process_regular_html(self, html_str):
         """Process regular HTML content by removing tags and cleaning up."""
         # Extract all hrefs from <a href=...>
-        hrefs = re.findall(r'<a [^>]*href="([^"]+)"[^>]*>', html_str, re.IGNORECASE)
+        hrefs = _RE_A_HREF.findall(html_str)
         
         # Replace each <a ...>...</a> with just the href
-        html_str_links_to_href = re.sub(r'<a [^>]*href="([^"]+)"[^>]*>[^<]*</a>', 
-                                       r'\1', html_str, flags=re.IGNORECASE)
+        html_str_links_to_href = _RE_A_BLOCK.sub(r'\1', html_str)
         
         # Remove all tags, convert HTML to text
-        html_str_no_tags = html_str_links_to_href.replace("<br>", "\n").replace("<br/>", "\n").replace("<br />", "\n")
-        html_str_no_tags = re.sub(r"</p\s*>", "\n", html_str_no_tags)
-        html_str_no_tags = re.sub(r"<[^>]+>", "", html_str_no_tags)
-        
-        # Decode HTML entities
-        html_str_no_tags = self._unescape_html(html_str_no_tags)
-        
-        # Decode literal escape sequences
-        html_str_no_tags = re.sub(r"\\(['\"])", r"\1", html_str_no_tags)
-        html_str_no_tags = re.sub(r"\\(['\"])", r"\1", html_str_no_tags)
-        
-        # Clean up whitespace characters
-        html_str_no_tags = html_str_no_tags.replace(u"\xa0", " ")
-        html_str_no_tags = html_str_no_tags.replace("&nbsp;", " ")
-        html_str_no_tags = html_str_no_tags.replace("\\xa0", " ")
-        html_str_no_tags = re.sub(u"[\u00A0\u2007\u202F]", " ", html_str_no_tags)
-        html_str_no_tags = html_str_no_tags.replace("\\r\\n", "\n").replace("\r\n", "\n").replace("\\n", "\n")
-        html_str_no_tags = html_str_no_tags.strip()
+        html_str_no_tags = _RE_LINE_BREAK.sub("\n", html_str_links_to_href)
+        html_str_no_tags = _RE_ANY_TAG.sub("", html_str_no_tags)
+        html_str_no_tags = self._clean_text(html_str_no_tags)
         
         # Add hrefs at the end if not already present
         if hrefs:
@@ -1070,37 +1537,87 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         return html_str_no_tags
 
+    def _clean_text(self, text):
+        """Decode entities and escapes and normalize whitespace in message text."""
+        # Decode HTML entities, including &nbsp;
+        if "&" in text:
+            text = _RE_HTML_ENTITY.sub(_html_entity_repl, text)
+        
+        # Decode literal escape sequences
+        text = _RE_ESCAPED_QUOTE.sub(r"\1", text)
+        
+        # Clean up whitespace characters
+        text = text.translate(_WS_TRANSLATE)
+        text = text.replace("\\xa0", " ")
+        text = _RE_NEWLINES.sub("\n", text)
+        return text.strip()
+
     def _get_contact_name_by_id(self, participant_id):
         """Get contact display name by participant ID."""
         if not participant_id or not self.contacts_map:
             return None
+        
+        # The same IDs come up for many messages, so the result of each
+        # lookup is kept, including scans of the contacts for partial matches
+        cache = self._contact_name_cache
+        if participant_id in cache:
+            return cache[participant_id]
             
         # Try direct lookup first
         if participant_id in self.contacts_map:
-            return self.contacts_map[participant_id]
-            
-        # Try partial matches for MRI format
-        participant_id_str = str(participant_id).strip()
-        for contact_id, display_name in self.contacts_map.items():
-            if contact_id and participant_id_str and (
-                contact_id == participant_id_str or
-                participant_id_str in contact_id or
-                contact_id in participant_id_str
-            ):
-                return display_name
-                
-        return None
+            match = self.contacts_map[participant_id]
+        else:
+            # Try partial matches for MRI format
+            participant_id_str = str(participant_id).strip()
+            match = None
+            for contact_id, display_name in self.contacts_map.items():
+                if contact_id and participant_id_str and (
+                    contact_id == participant_id_str or
+                    participant_id_str in contact_id or
+                    contact_id in participant_id_str
+                ):
+                    match = display_name
+                    break
+        
+        if len(cache) >= CONTACT_NAME_CACHE_SIZE:
+            cache.clear()
+        cache[participant_id] = match
+        return match
 
     def _enrich_creator_with_name(self, creator_id):
         """Enrich creator ID with contact name in parentheses."""
         if not creator_id:
             return creator_id
+        
+        # The same creators and participants come up for many records
+        cache = self._enriched_creator_cache
+        enriched = cache.get(creator_id)
+        if enriched is not None:
+            return enriched
             
         contact_name = self._get_contact_name_by_id(creator_id)
         if contact_name:
-            return "{} ({})".format(creator_id, contact_name)
+            enriched = "{} ({})".format(creator_id, contact_name)
         else:
-            return creator_id
+            enriched = creator_id
+        if len(cache) >= CONTACT_NAME_CACHE_SIZE:
+            cache.clear()
+        cache[creator_id] = enriched
+        return enriched
+
+    def _post_staged_artifacts(self, bb):
+        """Index the staged artifacts, with a single postArtifacts call when available."""
+        # The staging list is emptied in place, as the record loops hold on to it
+        staging = self._staging.artifacts
+        if not staging:
+            return
+        staged = staging[:]
+        del staging[:]
+        if self._post_artifacts is not None:
+            self._post_artifacts(staged, TeamsReplychainJSONParserFactory.moduleName)
+        else:
+            for art in staged:
+                bb.indexArtifact(art)
 
     def _post_processing_message(self, basename, counters):
         """Post processing completion message."""
@@ -1134,37 +1651,17 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
     def _calculate_call_duration(self, start_time, end_time):
         """Calculate call duration from start and end timestamps."""
         try:
-            def parse_timestamp_to_seconds(timestamp):
-                """Convert timestamp to seconds since epoch."""
-                if isinstance(timestamp, basestring) and ("T" in timestamp and ("-" in timestamp or ":" in timestamp)):
-                    timestamp_clean = timestamp.rstrip("Z")  # Remove trailing Z if present
-                    try:
-                        # Try with microseconds first
-                        if "." in timestamp_clean:
-                            dt = datetime.strptime(timestamp_clean[:26], "%Y-%m-%dT%H:%M:%S.%f")
-                        else:
-                            dt = datetime.strptime(timestamp_clean[:19], "%Y-%m-%dT%H:%M:%S")
-                        return calendar.timegm(dt.timetuple())
-                    except Exception:
-                        return None
-                else:
-                    # Handle numeric timestamps
-                    v = float(timestamp)
-                    if v > 9999999999:
-                        v = v / 1000.0
-                    return int(v)
-            
-            start_seconds = parse_timestamp_to_seconds(start_time)
-            end_seconds = parse_timestamp_to_seconds(end_time)
+            # Seconds since epoch, or None if a timestamp cannot be converted
+            start_seconds = _timestamp_value(start_time, True)
+            end_seconds = _timestamp_value(end_time, True)
             
             if start_seconds and end_seconds:
                 duration_seconds = end_seconds - start_seconds
                 if duration_seconds >= 0:
-                    # Format duration as HH:MM:SS
-                    hours = duration_seconds // 3600
-                    minutes = (duration_seconds % 3600) // 60
-                    seconds = duration_seconds % 60
-                    return "{:02d}:{:02d}:{:02d}".format(int(hours), int(minutes), int(seconds))
+                    # Format duration as HH:MM:SS; %d truncates as int() does
+                    minutes, seconds = divmod(duration_seconds, 60)
+                    hours, minutes = divmod(minutes, 60)
+                    return "%02d:%02d:%02d" % (hours, minutes, seconds)
         except Exception:
             return None
         
@@ -1238,9 +1735,19 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             # Handle dict format (single participant or complex structure)
             elif isinstance(participants_data, dict):
                 enriched_dict = dict(participants_data)  # Create a copy
+                
+                # Look for ID-like fields. Participant dicts mostly share a few
+                # key layouts, so the ID-like keys of each layout are kept.
+                shape = frozenset(participants_data)
+                id_keys = self._id_key_cache.get(shape)
+                if id_keys is None:
+                    id_keys = frozenset(key for key in participants_data
+                                        if any(part in key.lower() for part in ID_KEY_PARTS))
+                    if len(self._id_key_cache) >= ID_KEY_CACHE_SIZE:
+                        self._id_key_cache.clear()
+                    self._id_key_cache[shape] = id_keys
                 for key, value in participants_data.items():
-                    # Look for ID-like fields
-                    if any(id_key in key.lower() for id_key in ["id", "participant", "user", "mri"]):
+                    if key in id_keys:
                         contact_name = self._get_contact_name_by_id(value)
                         if contact_name:
                             enriched_dict[key + "_enriched_name"] = contact_name
@@ -1302,141 +1809,50 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         return thread_data
 
-    def _get_contact_name_by_id(self, user_id):
-        """Get contact display name by user ID from contacts map."""
-        if not user_id or not self.contacts_map:
-            return None
-        
-        contact = self.contacts_map.get(user_id)
-        if contact and isinstance(contact, dict):
-            return contact.get("displayName") or contact.get("name")
-        
-        return None
-
-    def _extract_call_recording_attributes(self, call_activity):
-        """Extract recording-specific attributes from call activity."""
-        attributes = {}
-        
-        content = call_activity.get("content", "")
-        if isinstance(content, basestring):
-            # Extract recording filename
-            recording_match = re.search(r'<recording[^>]*?filename="([^"]*)"', content)
-            if recording_match:
-                attributes["recording_filename"] = recording_match.group(1)
-            
-            # Extract recording duration
-            duration_match = re.search(r'<recording[^>]*?duration="([^"]*)"', content)
-            if duration_match:
-                attributes["recording_duration"] = duration_match.group(1)
-            
-            # Extract transcript filename
-            transcript_match = re.search(r'<transcript[^>]*?filename="([^"]*)"', content)
-            if transcript_match:
-                attributes["transcript_filename"] = transcript_match.group(1)
-        
-        return attributes
-
-    def _extract_meeting_attributes(self, message):
-        """Extract meeting-specific attributes from Event/Call message."""
-        attributes = {}
-        
-        # Extract thread topic as meeting title
-        thread_topic = message.get("threadTopic", "")
-        if thread_topic:
-            attributes["meeting_title"] = thread_topic
-        
-        # Extract meeting ID from content
-        content = message.get("content", "")
-        if isinstance(content, basestring):
-            # Look for meeting ID patterns
-            meeting_id_match = re.search(r'meetingId["\s]*[:=]\s*["\']([^"\']*)', content)
-            if not meeting_id_match:
-                meeting_id_match = re.search(r'conference[iI]d["\s]*[:=]\s*["\']([^"\']*)', content)
-            
-            if meeting_id_match:
-                attributes["meeting_id"] = meeting_id_match.group(1)
-        
-        # Extract organizer from properties
-        properties = message.get("properties", {})
-        if isinstance(properties, dict):
-            organizer = properties.get("organizer") or properties.get("creator")
-            if organizer:
-                attributes["organizer"] = self._format_participant_info(organizer)
-        
-        return attributes
-
-    def _add_call_log_attributes(self, artifact, call_log):
-        """Add call log specific attributes to artifact."""
-        try:
-            # Add call duration
-            start_time = call_log.get("start_time")
-            end_time = call_log.get("end_time")
-            if start_time and end_time:
-                duration = self._calculate_call_duration(start_time, end_time)
-                if duration:
-                    artifact.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DATETIME_END.getTypeID(), 
-                                                            self.module_name, duration))
-            
-            # Add call type
-            call_type = call_log.get("call_type", "Unknown")
-            artifact.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_DESCRIPTION.getTypeID(), 
-                                                    self.module_name, call_type))
-            
-            # Add participants
-            participants = call_log.get("participants", "")
-            if participants:
-                artifact.addAttribute(BlackboardAttribute(BlackboardAttribute.ATTRIBUTE_TYPE.TSK_USER_NAME.getTypeID(), 
-                                                        self.module_name, participants))
-        
-        except Exception as e:
-            self._log_error("Error adding call log attributes: {}".format(str(e)))
-    
     def _determine_thread_artifact_type(self, threadId):
         """Determine the appropriate artifact type based on thread ID."""
-        if threadId.endswith("@thread.v2"):
-            return self.art_group_chat
-        elif threadId.endswith("@unq.gbl.spaces"):
-            return self.art_private_chat
-        elif threadId.endswith("@thread.tacv2"):
-            return self.art_teams_chat
-        else:
-            return self.art_thread
+        for suffix, artifact_type in self._thread_suffixes:
+            if threadId.endswith(suffix):
+                return artifact_type
+        return self.art_thread
     
     def _populate_thread_artifact(self, art, threadId, threadType, teamId, tenantId, thread_data):
         """Populate thread artifact with attributes."""
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_THREAD_ID"], ARTIFACT_PREFIX, threadId))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_THREAD_TYPE"], ARTIFACT_PREFIX, threadType))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenantId if tenantId else ""))
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_thread_id, ARTIFACT_PREFIX, threadId))
+        attrs.add(BlackboardAttribute(self._a_thread_type, ARTIFACT_PREFIX, threadType))
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenantId if tenantId else ""))
         if threadId.endswith("@thread.tacv2") and teamId:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TEAMID"], ARTIFACT_PREFIX, teamId))
+            attrs.add(BlackboardAttribute(self._a_teamid, ARTIFACT_PREFIX, teamId))
         
         # Add thread data attributes if available
         if thread_data:
             # Add topic
             if "topic" in thread_data:
-                topic = self._safe_unicode(thread_data["topic"])
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TOPIC"], ARTIFACT_PREFIX, topic))
+                topic = _safe_unicode(thread_data["topic"])
+                attrs.add(BlackboardAttribute(self._a_topic, ARTIFACT_PREFIX, topic))
             
             # Add description
             if "description" in thread_data:
-                description = self._safe_unicode(thread_data["description"])
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TOPIC_DESCRIP"], ARTIFACT_PREFIX, description))
+                description = _safe_unicode(thread_data["description"])
+                attrs.add(BlackboardAttribute(self._a_topic_descrip, ARTIFACT_PREFIX, description))
             
             # Add creator
             if "creator" in thread_data:
-                creator = self._safe_unicode(thread_data["creator"])
+                creator = _safe_unicode(thread_data["creator"])
                 enriched_creator = self._enrich_creator_with_name(creator)
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CREATOR"], ARTIFACT_PREFIX, enriched_creator))
+                attrs.add(BlackboardAttribute(self._a_creator, ARTIFACT_PREFIX, enriched_creator))
             
             # Add creation time
             if "created_at" in thread_data:
-                created_at = self._safe_unicode(thread_data["created_at"])
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CREATEDAT"], ARTIFACT_PREFIX, created_at))
+                created_at = _safe_unicode(thread_data["created_at"])
+                attrs.add(BlackboardAttribute(self._a_createdat, ARTIFACT_PREFIX, created_at))
             
             # Add has draft status
             if "has_draft" in thread_data:
-                has_draft = self._safe_unicode(thread_data["has_draft"])
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_HASDRAFT"], ARTIFACT_PREFIX, has_draft))
+                has_draft = _safe_unicode(thread_data["has_draft"])
+                attrs.add(BlackboardAttribute(self._a_hasdraft, ARTIFACT_PREFIX, has_draft))
+        art.addAttributes(attrs)
     
     def _process_thread_members(self, threadId, members_dict, jsonFile, bb):
         """Extract and create artifacts for thread members.
@@ -1466,78 +1882,85 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             art = jsonFile.newArtifact(self.art_thread_member.getTypeID())
             
             # Add attributes
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MEMBER_THREAD_ID"], ARTIFACT_PREFIX, self._safe_unicode(threadId)))
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MEMBER_ID"], ARTIFACT_PREFIX, self._safe_unicode(member_id)))
+            attrs = ArrayList()
+            attrs.add(BlackboardAttribute(self._a_member_thread_id, ARTIFACT_PREFIX, _safe_unicode(threadId)))
+            attrs.add(BlackboardAttribute(self._a_member_id, ARTIFACT_PREFIX, _safe_unicode(member_id)))
             
             if role:
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MEMBER_ROLE"], ARTIFACT_PREFIX, self._safe_unicode(role)))
+                attrs.add(BlackboardAttribute(self._a_member_role, ARTIFACT_PREFIX, _safe_unicode(role)))
             
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MEMBER_ISREADER"], ARTIFACT_PREFIX, "True" if is_reader else "False"))
+            attrs.add(BlackboardAttribute(self._a_member_isreader, ARTIFACT_PREFIX, "True" if is_reader else "False"))
             
             # Enrich with display name from contacts if available
             display_name = self.contacts_map.get(member_id, "")
             if display_name:
-                art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MEMBER_DISPLAYNAME"], ARTIFACT_PREFIX, self._safe_unicode(display_name)))
-            
-            bb.indexArtifact(art)
+                attrs.add(BlackboardAttribute(self._a_member_displayname, ARTIFACT_PREFIX, _safe_unicode(display_name)))
+            art.addAttributes(attrs)
+            self._staging.artifacts.append(art)
     
     def _populate_contact_artifact(self, art, contact_data):
         """Populate contact artifact with attributes."""
         if not isinstance(contact_data, dict):
             return
         
+        attrs = ArrayList()
+        
         # Add display name
         displayName = contact_data.get("displayName")
         if displayName:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_DISPLAYNAME"], ARTIFACT_PREFIX, self._safe_unicode(displayName)))
+            attrs.add(BlackboardAttribute(self._a_contact_displayname, ARTIFACT_PREFIX, _safe_unicode(displayName)))
         
         # Add email
         email = contact_data.get("email")
         if email:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_EMAIL"], ARTIFACT_PREFIX, self._safe_unicode(email)))
+            attrs.add(BlackboardAttribute(self._a_contact_email, ARTIFACT_PREFIX, _safe_unicode(email)))
         
         # Add MRI (Microsoft Resource Identifier)
         mri = contact_data.get("mri")
         if mri:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_MRI"], ARTIFACT_PREFIX, self._safe_unicode(mri)))
+            attrs.add(BlackboardAttribute(self._a_contact_mri, ARTIFACT_PREFIX, _safe_unicode(mri)))
         
         # Add tenant information
         tenantId = contact_data.get("tenantId")
         if tenantId:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_TENANT"], ARTIFACT_PREFIX, self._safe_unicode(tenantId)))
+            attrs.add(BlackboardAttribute(self._a_contact_tenant, ARTIFACT_PREFIX, _safe_unicode(tenantId)))
         
         # Add given name (first name)
         givenName = contact_data.get("givenName")
         if givenName:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_GIVEN_NAME"], ARTIFACT_PREFIX, self._safe_unicode(givenName)))
+            attrs.add(BlackboardAttribute(self._a_contact_given_name, ARTIFACT_PREFIX, _safe_unicode(givenName)))
         
         # Add surname (last name)
         surname = contact_data.get("surname")
         if surname and surname.strip():  # Only add if not empty
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_SURNAME"], ARTIFACT_PREFIX, self._safe_unicode(surname)))
+            attrs.add(BlackboardAttribute(self._a_contact_surname, ARTIFACT_PREFIX, _safe_unicode(surname)))
         
         # Add object ID (Azure AD)
         objectId = contact_data.get("objectId")
         if objectId:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_OBJECT_ID"], ARTIFACT_PREFIX, self._safe_unicode(objectId)))
+            attrs.add(BlackboardAttribute(self._a_contact_object_id, ARTIFACT_PREFIX, _safe_unicode(objectId)))
         
         # Add user type (ADUser, BOT, Federated, etc.)
         userType = contact_data.get("type")
         if userType:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_USER_TYPE"], ARTIFACT_PREFIX, self._safe_unicode(userType)))
+            attrs.add(BlackboardAttribute(self._a_contact_user_type, ARTIFACT_PREFIX, _safe_unicode(userType)))
         
         # Add user principal name
         upn = contact_data.get("userPrincipalName")
         if upn:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTACT_UPN"], ARTIFACT_PREFIX, self._safe_unicode(upn)))
+            attrs.add(BlackboardAttribute(self._a_contact_upn, ARTIFACT_PREFIX, _safe_unicode(upn)))
+        
+        if not attrs.isEmpty():
+            art.addAttributes(attrs)
     
-    def _process_call_log(self, msg, conversation_id, jsonFile, bb):
+    def _process_call_log(self, msg, conversation_id, tenant_id, jsonFile, bb):
         """
         Process call log message from 48:calllogs conversation.
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation (should be "48:calllogs")
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
             
@@ -1552,8 +1975,9 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             return 0
         
         # Extract call log data
+        calllog_raw = properties["call-log"]
         try:
-            calllog_data = json.loads(properties["call-log"]) if isinstance(properties["call-log"], basestring) else properties["call-log"]
+            calllog_data = json.loads(calllog_raw) if isinstance(calllog_raw, basestring) else calllog_raw
         except Exception:
             calllog_data = {}
         
@@ -1564,23 +1988,8 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         orig_arrival = msg.get("originalArrivalTime")
         
         # Convert to safe unicode strings
-        content = self._safe_unicode(content)
-        msg_id = self._safe_unicode(msg_id)
-        
-        # Extract call log specific fields
-        start_time = calllog_data.get("startTime")
-        end_time = calllog_data.get("endTime")
-        call_direction = calllog_data.get("callDirection")
-        call_type = calllog_data.get("callType")
-        call_state = calllog_data.get("callState")
-        call_id_val = calllog_data.get("callId")
-        originator_part = calllog_data.get("originatorParticipant", {})
-        target_part = calllog_data.get("targetParticipant", {})
-        participants = calllog_data.get("participants")
-        participant_list = calllog_data.get("participantList")
-        
-        # Get tenant ID for this conversation
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
+        content = _safe_unicode(content)
+        msg_id = _safe_unicode(msg_id)
         
         # Convert timestamps
         orig_arrival_ts = self._convert_timestamp(orig_arrival, for_datetime_attr=True)
@@ -1591,75 +2000,59 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         # Create call log artifact
         art = jsonFile.newArtifact(self.art_calllog_conv.getTypeID())
         
-        # Add basic attributes
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONV_ID"], ARTIFACT_PREFIX, conversation_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_SEQ_ID"], ARTIFACT_PREFIX, str(seq_id)))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTENT"], ARTIFACT_PREFIX, content))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_TYPE"], ARTIFACT_PREFIX, msg_type))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_PROPERTIES"], ARTIFACT_PREFIX, properties_json))
+        # Add basic attributes; they are handed over in a single call
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_conv_id, ARTIFACT_PREFIX, conversation_id))
+        attrs.add(BlackboardAttribute(self._a_seq_id, ARTIFACT_PREFIX, str(seq_id)))
+        attrs.add(BlackboardAttribute(self._a_content, ARTIFACT_PREFIX, content))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
+        attrs.add(BlackboardAttribute(self._a_msg_type, ARTIFACT_PREFIX, msg_type))
+        attrs.add(BlackboardAttribute(self._a_properties, ARTIFACT_PREFIX, properties_json))
         
         if orig_arrival_ts:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ORIG_ARRIVAL"], ARTIFACT_PREFIX, orig_arrival_ts))
+            attrs.add(BlackboardAttribute(self._a_orig_arrival, ARTIFACT_PREFIX, orig_arrival_ts))
         
         # Add call-specific attributes
-        self._add_call_log_attributes(art, calllog_data, bb)
+        self._add_call_log_attributes(attrs, calllog_data, bb)
+        art.addAttributes(attrs)
         
-        bb.indexArtifact(art)
+        self._staging.artifacts.append(art)
         return 1
 
-    def _add_call_log_attributes(self, art, calllog_data, bb):
-        """Add call log specific attributes to artifact."""
-        # Create additional call log attributes if they don't exist
-        if not hasattr(self, 'attr_calllog_extras'):
-            self.attr_calllog_extras = {}
-            for name, vtype, desc in [
-                ("TSK_TEAMS_CALLLOG_STARTTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Start Time"),
-                ("TSK_TEAMS_CALLLOG_ENDTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "End Time"),
-                ("TSK_TEAMS_CALLLOG_DURATION_CALC", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Duration (hh:mm:ss)"),
-                ("TSK_TEAMS_CALLLOG_DIRECTION", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Direction"),
-                ("TSK_TEAMS_CALLLOG_CALLTYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call Type"),
-                ("TSK_TEAMS_CALLLOG_STATE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "State"),
-                ("TSK_TEAMS_CALLLOG_CALLID2", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Call ID"),
-                ("TSK_TEAMS_CALLLOG_ORIGINATOR", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Originator"),
-                ("TSK_TEAMS_CALLLOG_TARGET", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Target Participant"),
-                ("TSK_TEAMS_CALLLOG_PARTICIPANTS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Participants List"),
-                ("TSK_TEAMS_CALLLOG_PARTICIPANT_LIST", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Participants List (json)")
-            ]:
-                self.attr_calllog_extras[name] = bb.getOrAddAttributeType(name, vtype, desc)
-        
+    def _add_call_log_attributes(self, attrs, calllog_data, bb):
+        """Add call log specific attributes to the artifact's attribute list."""
         # Add attributes with values
         start_time = calllog_data.get("startTime")
         end_time = calllog_data.get("endTime")
         
         if start_time:
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_STARTTIME"], 
-                                               ARTIFACT_PREFIX, self._convert_timestamp(start_time, for_datetime_attr=False)))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_STARTTIME"], 
+                                        ARTIFACT_PREFIX, self._convert_timestamp(start_time, for_datetime_attr=False)))
         if end_time:
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_ENDTIME"], 
-                                               ARTIFACT_PREFIX, self._convert_timestamp(end_time, for_datetime_attr=False)))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_ENDTIME"], 
+                                        ARTIFACT_PREFIX, self._convert_timestamp(end_time, for_datetime_attr=False)))
         
         # Calculate and add duration
         if start_time and end_time:
             duration = self._calculate_call_duration(start_time, end_time)
             if duration:
-                art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_DURATION_CALC"], 
-                                                   ARTIFACT_PREFIX, duration))
+                attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_DURATION_CALC"], 
+                                            ARTIFACT_PREFIX, duration))
         
         # Add other call log fields
         if calllog_data.get("callDirection"):
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_DIRECTION"], 
-                                               ARTIFACT_PREFIX, str(calllog_data["callDirection"])))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_DIRECTION"], 
+                                        ARTIFACT_PREFIX, str(calllog_data["callDirection"])))
         if calllog_data.get("callType"):
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_CALLTYPE"], 
-                                               ARTIFACT_PREFIX, str(calllog_data["callType"])))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_CALLTYPE"], 
+                                        ARTIFACT_PREFIX, str(calllog_data["callType"])))
         if calllog_data.get("callState"):
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_STATE"], 
-                                               ARTIFACT_PREFIX, str(calllog_data["callState"])))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_STATE"], 
+                                        ARTIFACT_PREFIX, str(calllog_data["callState"])))
         if calllog_data.get("callId"):
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_CALLID2"], 
-                                               ARTIFACT_PREFIX, str(calllog_data["callId"])))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_CALLID2"], 
+                                        ARTIFACT_PREFIX, str(calllog_data["callId"])))
         
         # Add participant information
         originator_part = calllog_data.get("originatorParticipant", {})
@@ -1667,13 +2060,13 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         if originator_part:
             originator_str = self._format_participant_info(originator_part)
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_ORIGINATOR"], 
-                                               ARTIFACT_PREFIX, originator_str))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_ORIGINATOR"], 
+                                        ARTIFACT_PREFIX, originator_str))
         
         if target_part:
             target_str = self._format_participant_info(target_part)
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_TARGET"], 
-                                               ARTIFACT_PREFIX, target_str))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_TARGET"], 
+                                        ARTIFACT_PREFIX, target_str))
         
         # Add participant lists
         participants = calllog_data.get("participants")
@@ -1681,24 +2074,31 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         
         if participants:
             participants_str = self._format_participants_list(participants)
-            art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_PARTICIPANTS"], 
-                                               ARTIFACT_PREFIX, participants_str))
+            attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_PARTICIPANTS"], 
+                                        ARTIFACT_PREFIX, participants_str))
         
         if participant_list:
             try:
-                participant_list_json = json.dumps(participant_list, ensure_ascii=False, separators=(',', ':'))
-                art.addAttribute(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_PARTICIPANT_LIST"], 
-                                                   ARTIFACT_PREFIX, participant_list_json))
+                # The usual flat participant records are written directly
+                # rather than by json's encoder
+                participant_list_json = None
+                if participant_list.__class__ is list:
+                    participant_list_json = _flat_records_json(participant_list)
+                if participant_list_json is None:
+                    participant_list_json = _compact_json(participant_list)
+                attrs.add(BlackboardAttribute(self.attr_calllog_extras["TSK_TEAMS_CALLLOG_PARTICIPANT_LIST"], 
+                                            ARTIFACT_PREFIX, participant_list_json))
             except Exception:
                 pass
     
-    def _process_call_activity(self, msg, conversation_id, jsonFile, bb):
+    def _process_call_activity(self, msg, conversation_id, tenant_id, jsonFile, bb):
         """
         Process call activity message (recordings, transcripts).
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
             
@@ -1706,20 +2106,13 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             int: Number of call activities processed (0 or 1)
         """
         # Extract message data
-        seq_id = msg.get("sequenceId")
-        content = msg.get("content", "")
-        msg_id = msg.get("id")
-        msg_type = msg.get("messageType")
-        orig_arrival = msg.get("originalArrivalTime")
+        seq_id, content, msg_id, msg_type, orig_arrival = map(msg.get, CALL_ACTIVITY_FIELDS)
         properties = msg.get("properties", {})
         
         # Convert to safe unicode strings
-        content = self._safe_unicode(content)
-        msg_id = self._safe_unicode(msg_id)
-        msg_type = self._safe_unicode(msg_type)
-        
-        # Get tenant ID for this conversation
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
+        content = _safe_unicode(content)
+        msg_id = _safe_unicode(msg_id)
+        msg_type = self._message_type_text(msg_type)
         
         # Convert timestamps
         orig_arrival_ts = self._convert_timestamp(orig_arrival, for_datetime_attr=True)
@@ -1733,89 +2126,94 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         # Create call activity artifact
         art = jsonFile.newArtifact(self.art_calllog_msg.getTypeID())
         
-        # Add basic attributes
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONV_ID"], ARTIFACT_PREFIX, conversation_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_SEQ_ID"], ARTIFACT_PREFIX, str(seq_id)))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTENT"], ARTIFACT_PREFIX, content))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_TYPE"], ARTIFACT_PREFIX, msg_type))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_PROPERTIES"], ARTIFACT_PREFIX, properties_json))
+        # Add basic attributes; they are handed over in a single call
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_conv_id, ARTIFACT_PREFIX, conversation_id))
+        attrs.add(BlackboardAttribute(self._a_seq_id, ARTIFACT_PREFIX, str(seq_id)))
+        attrs.add(BlackboardAttribute(self._a_content, ARTIFACT_PREFIX, content))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
+        attrs.add(BlackboardAttribute(self._a_msg_type, ARTIFACT_PREFIX, msg_type))
+        attrs.add(BlackboardAttribute(self._a_properties, ARTIFACT_PREFIX, properties_json))
         
         # Add timestamps
         if orig_arrival_ts:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ORIG_ARRIVAL"], ARTIFACT_PREFIX, orig_arrival_ts))
+            attrs.add(BlackboardAttribute(self._a_orig_arrival, ARTIFACT_PREFIX, orig_arrival_ts))
         if edit_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_EDIT_TIME"], ARTIFACT_PREFIX, edit_time_val))
+            attrs.add(BlackboardAttribute(self._a_edit_time, ARTIFACT_PREFIX, edit_time_val))
         if compose_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_COMPOSE_TIME"], ARTIFACT_PREFIX, compose_time_val))
+            attrs.add(BlackboardAttribute(self._a_compose_time, ARTIFACT_PREFIX, compose_time_val))
         if delete_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_DELETE_TIME"], ARTIFACT_PREFIX, delete_time_val))
+            attrs.add(BlackboardAttribute(self._a_delete_time, ARTIFACT_PREFIX, delete_time_val))
         
         # Extract special attributes for call recordings
         if msg_type == "RichText/Media_CallRecording":
-            self._extract_call_recording_attributes(art, content)
+            self._extract_call_recording_attributes(attrs, content)
+        art.addAttributes(attrs)
         
-        bb.indexArtifact(art)
+        self._staging.artifacts.append(art)
         return 1
 
-    def _extract_call_recording_attributes(self, art, content):
-        """Extract specific attributes from call recording content."""
+    def _extract_call_recording_attributes(self, attrs, content):
+        """Extract specific attributes from call recording content into the attribute list."""
+        # Content without any tag, e.g. a plain text notice, has none of them
+        if "<" not in content:
+            return
+        
+        values = {}
+        for field, tag, key, after, allow_empty in _REC_FIELDS:
+            value = _find_tag_attr(content, tag, key, after, allow_empty)
+            if value is not None:
+                values[field] = value
+        
         # Recording status
-        match = re.search(r'<RecordingStatus[^>]*status="([^"]+)"', content)
-        if match:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_STATUS"], ARTIFACT_PREFIX, match.group(1)))
+        if "status" in values:
+            attrs.add(BlackboardAttribute(self._a_calllog_status, ARTIFACT_PREFIX, values["status"]))
         
         # Original name
-        match = re.search(r'<OriginalName[^>]*v="([^"]+)"', content)
-        if match:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_ORIGINALNAME"], ARTIFACT_PREFIX, match.group(1)))
+        if "original_name" in values:
+            attrs.add(BlackboardAttribute(self._a_calllog_originalname, ARTIFACT_PREFIX, values["original_name"]))
         
         # Recording initiator
-        match = re.search(r'<RecordingInitiatorId[^>]*value="([^"]+)"', content)
-        if match:
-            initiator_id = match.group(1)
+        if "initiator" in values:
+            initiator_id = values["initiator"]
             enriched_initiator_id = self._enrich_creator_with_name(initiator_id)
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_INITIATOR"], ARTIFACT_PREFIX, enriched_initiator_id))
+            attrs.add(BlackboardAttribute(self._a_calllog_initiator, ARTIFACT_PREFIX, enriched_initiator_id))
         
         # Recording terminator
-        match = re.search(r'<RecordingTerminatorId[^>]*value="([^"]+)"', content)
-        if match:
-            terminator_id = match.group(1)
+        if "terminator" in values:
+            terminator_id = values["terminator"]
             enriched_terminator_id = self._enrich_creator_with_name(terminator_id)
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_TERMINATOR"], ARTIFACT_PREFIX, enriched_terminator_id))
+            attrs.add(BlackboardAttribute(self._a_calllog_terminator, ARTIFACT_PREFIX, enriched_terminator_id))
         
         # Call ID
-        match = re.search(r'<Id[^>]*type="callId"[^>]*value="([^"]+)"', content)
-        if match:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_CALLID"], ARTIFACT_PREFIX, match.group(1)))
+        if "call_id" in values:
+            attrs.add(BlackboardAttribute(self._a_calllog_callid, ARTIFACT_PREFIX, values["call_id"]))
         
         # Duration
-        match = re.search(r'<RecordingContent[^>]*duration="([^"]+)"', content)
-        if match:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_DURATION"], ARTIFACT_PREFIX, match.group(1)))
+        if "duration" in values:
+            attrs.add(BlackboardAttribute(self._a_calllog_duration, ARTIFACT_PREFIX, values["duration"]))
         
         # Timestamp
-        match = re.search(r'<RecordingContent[^>]*timestamp="([^"]+)"', content)
-        if match:
-            timestamp_raw = match.group(1)
+        if "timestamp" in values:
+            timestamp_raw = values["timestamp"]
             timestamp_formatted = self._convert_timestamp(timestamp_raw, for_datetime_attr=False)
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_TIMESTAMP"], ARTIFACT_PREFIX, timestamp_formatted))
+            attrs.add(BlackboardAttribute(self._a_calllog_timestamp, ARTIFACT_PREFIX, timestamp_formatted))
         
         # Meeting organizer
-        match = re.search(r'<MeetingOrganizerId[^>]*value="([^"]*)"', content)
-        if match:
-            organizer_id = match.group(1)
+        if "meeting_organizer" in values:
+            organizer_id = values["meeting_organizer"]
             enriched_organizer_id = self._enrich_creator_with_name(organizer_id) if organizer_id else ""
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CALLLOG_MEETING_ORGID"], ARTIFACT_PREFIX, enriched_organizer_id))
+            attrs.add(BlackboardAttribute(self._a_calllog_meeting_orgid, ARTIFACT_PREFIX, enriched_organizer_id))
     
-    def _process_meeting_event(self, msg, conversation_id, jsonFile, bb):
+    def _process_meeting_event(self, msg, conversation_id, tenant_id, jsonFile, bb):
         """
         Process meeting event message (Event/Call type).
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
             
@@ -1823,22 +2221,14 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
             int: Number of meeting events processed (0 or 1)
         """
         # Extract message data
-        seq_id = msg.get("sequenceId")
-        content = msg.get("content", "")
-        msg_id = msg.get("id")
-        creator = msg.get("creator")
-        msg_type = msg.get("messageType")
-        orig_arrival = msg.get("originalArrivalTime")
+        seq_id, content, msg_id, creator, msg_type, orig_arrival = map(msg.get, MEETING_FIELDS)
         properties = msg.get("properties", {})
         
         # Convert to safe unicode strings
-        content = self._safe_unicode(content)
-        msg_id = self._safe_unicode(msg_id)
-        creator = self._safe_unicode(creator)
-        msg_type = self._safe_unicode(msg_type)
-        
-        # Get tenant ID for this conversation
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
+        content = _safe_unicode(content)
+        msg_id = _safe_unicode(msg_id)
+        creator = _safe_unicode(creator)
+        msg_type = self._message_type_text(msg_type)
         
         # Convert timestamps
         orig_arrival_ts = self._convert_timestamp(orig_arrival, for_datetime_attr=True)
@@ -1855,46 +2245,36 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         # Create meeting event artifact
         art = jsonFile.newArtifact(self.art_eventcall.getTypeID())
         
-        # Add basic attributes
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONV_ID"], ARTIFACT_PREFIX, conversation_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_SEQ_ID"], ARTIFACT_PREFIX, str(seq_id)))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CONTENT"], ARTIFACT_PREFIX, content))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_CREATOR"], ARTIFACT_PREFIX, enriched_creator))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_MSG_TYPE"], ARTIFACT_PREFIX, msg_type))
-        art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_PROPERTIES"], ARTIFACT_PREFIX, properties_json))
+        # Add basic attributes; they are handed over in a single call
+        attrs = ArrayList()
+        attrs.add(BlackboardAttribute(self._a_tenantid, ARTIFACT_PREFIX, tenant_id))
+        attrs.add(BlackboardAttribute(self._a_conv_id, ARTIFACT_PREFIX, conversation_id))
+        attrs.add(BlackboardAttribute(self._a_seq_id, ARTIFACT_PREFIX, str(seq_id)))
+        attrs.add(BlackboardAttribute(self._a_content, ARTIFACT_PREFIX, content))
+        attrs.add(BlackboardAttribute(self._a_msg_id, ARTIFACT_PREFIX, msg_id))
+        attrs.add(BlackboardAttribute(self._a_creator, ARTIFACT_PREFIX, enriched_creator))
+        attrs.add(BlackboardAttribute(self._a_msg_type, ARTIFACT_PREFIX, msg_type))
+        attrs.add(BlackboardAttribute(self._a_properties, ARTIFACT_PREFIX, properties_json))
         
         # Add timestamps
         if orig_arrival_ts:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_ORIG_ARRIVAL"], ARTIFACT_PREFIX, orig_arrival_ts))
+            attrs.add(BlackboardAttribute(self._a_orig_arrival, ARTIFACT_PREFIX, orig_arrival_ts))
         if edit_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_EDIT_TIME"], ARTIFACT_PREFIX, edit_time_val))
+            attrs.add(BlackboardAttribute(self._a_edit_time, ARTIFACT_PREFIX, edit_time_val))
         if compose_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_COMPOSE_TIME"], ARTIFACT_PREFIX, compose_time_val))
+            attrs.add(BlackboardAttribute(self._a_compose_time, ARTIFACT_PREFIX, compose_time_val))
         if delete_time_val:
-            art.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_DELETE_TIME"], ARTIFACT_PREFIX, delete_time_val))
+            attrs.add(BlackboardAttribute(self._a_delete_time, ARTIFACT_PREFIX, delete_time_val))
         
         # Extract meeting-specific attributes
-        self._extract_meeting_attributes(art, properties, bb)
+        self._extract_meeting_attributes(attrs, properties, bb)
+        art.addAttributes(attrs)
         
-        bb.indexArtifact(art)
+        self._staging.artifacts.append(art)
         return 1
 
-    def _extract_meeting_attributes(self, art, properties, bb):
-        """Extract meeting-specific attributes from properties."""
-        # Create additional meeting attributes if they don't exist
-        if not hasattr(self, 'attr_eventcall_extras'):
-            self.attr_eventcall_extras = {}
-            for name, vtype, desc in [
-                ("TSK_TEAMS_EVENTCALL_PARTICIPANTS", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Participants"),
-                ("TSK_TEAMS_EVENTCALL_ORGANIZERUPN", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Organizer Email"),
-                ("TSK_TEAMS_EVENTCALL_MEETINGTYPE", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Type"),
-                ("TSK_TEAMS_EVENTCALL_STARTTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting Start Time"),
-                ("TSK_TEAMS_EVENTCALL_ENDTIME", BlackboardAttribute.TSK_BLACKBOARD_ATTRIBUTE_VALUE_TYPE.STRING, "Meeting End Time")
-            ]:
-                self.attr_eventcall_extras[name] = bb.getOrAddAttributeType(name, vtype, desc)
-        
+    def _extract_meeting_attributes(self, attrs, properties, bb):
+        """Extract meeting-specific attributes from properties into the attribute list."""
         if not isinstance(properties, dict):
             return
         
@@ -1903,44 +2283,45 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         if participants:
             participants_enriched = self._enrich_participants_with_names(participants)
             try:
-                participants_str = json.dumps(participants_enriched, ensure_ascii=False, separators=(',', ':'))
-                art.addAttribute(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_PARTICIPANTS"], 
-                                                   ARTIFACT_PREFIX, participants_str))
+                participants_str = _compact_json(participants_enriched)
+                attrs.add(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_PARTICIPANTS"], 
+                                            ARTIFACT_PREFIX, participants_str))
             except Exception:
                 pass
         
         # Extract organizer information
         organizer_upn = properties.get("organizerUpn")
         if organizer_upn:
-            art.addAttribute(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_ORGANIZERUPN"], 
-                                               ARTIFACT_PREFIX, str(organizer_upn)))
+            attrs.add(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_ORGANIZERUPN"], 
+                                        ARTIFACT_PREFIX, str(organizer_upn)))
         
         # Extract meeting type
         meeting_type = properties.get("meetingType")
         if meeting_type:
-            art.addAttribute(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_MEETINGTYPE"], 
-                                               ARTIFACT_PREFIX, str(meeting_type)))
+            attrs.add(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_MEETINGTYPE"], 
+                                        ARTIFACT_PREFIX, str(meeting_type)))
         
         # Extract meeting times
         start_time = properties.get("startTime")
         if start_time:
             start_time_formatted = self._convert_timestamp(start_time, for_datetime_attr=False)
-            art.addAttribute(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_STARTTIME"], 
-                                               ARTIFACT_PREFIX, start_time_formatted))
+            attrs.add(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_STARTTIME"], 
+                                        ARTIFACT_PREFIX, start_time_formatted))
         
         end_time = properties.get("endTime")
         if end_time:
             end_time_formatted = self._convert_timestamp(end_time, for_datetime_attr=False)
-            art.addAttribute(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_ENDTIME"], 
-                                               ARTIFACT_PREFIX, end_time_formatted))
+            attrs.add(BlackboardAttribute(self.attr_eventcall_extras["TSK_TEAMS_EVENTCALL_ENDTIME"], 
+                                        ARTIFACT_PREFIX, end_time_formatted))
     
-    def _process_message_reactions(self, msg, conversation_id, jsonFile, bb):
+    def _process_message_reactions(self, msg, conversation_id, tenant_id, jsonFile, bb):
         """
         Process message reactions (emotions/likes).
         
         Args:
             msg: Message data dictionary
             conversation_id: ID of the conversation
+            tenant_id: Tenant ID of the conversation
             jsonFile: File object from Autopsy
             bb: Blackboard instance
         """
@@ -1948,38 +2329,56 @@ class TeamsReplychainJSONParser(DataSourceIngestModule):
         if not isinstance(properties, dict):
             return
         
-        msg_id = self._safe_unicode(msg.get("id"))
+        msg_id = _safe_unicode(msg.get("id"))
         seq_id = msg.get("sequenceId")
-        tenant_id = self.conversation_tenant_map.get(conversation_id, "")
         
         # Process emotions/reactions
-        for react_key in ["emotions"]:
-            react_obj = properties.get(react_key)
-            if react_obj and isinstance(react_obj, dict):
-                values = react_obj.get("values", [])
-                for v in values:
-                    reaction_type = v.get("key")
-                    users_obj = v.get("users", {})
-                    users = users_obj.get("values", []) if isinstance(users_obj, dict) else []
-                    
-                    for u in users:
-                        mri = u.get("mri", "")
-                        time_val = u.get("time", None)
-                        time_val = self._convert_timestamp(time_val, for_datetime_attr=True)
-                        
-                        # Enrich MRI with contact name in parentheses
-                        enriched_mri = self._enrich_creator_with_name(mri) if mri else mri
-                        
-                        # Create reaction artifact
-                        art_react = jsonFile.newArtifact(self.art_reaction.getTypeID())
-                        art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_TENANTID"], ARTIFACT_PREFIX, tenant_id))
-                        art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_REACTION_MSG_ID"], ARTIFACT_PREFIX, msg_id))
-                        art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_REACTION_SEQ_ID"], ARTIFACT_PREFIX, str(seq_id)))
-                        art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_REACTION_TYPE"], ARTIFACT_PREFIX, reaction_type if reaction_type else ""))
-                        art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_REACTION_MRI"], ARTIFACT_PREFIX, enriched_mri))
-                        
-                        if time_val:
-                            art_react.addAttribute(BlackboardAttribute(self.attr["TSK_TEAMS_REACTION_TIME"], ARTIFACT_PREFIX, time_val))
-                        
-
-                        bb.indexArtifact(art_react)
+        emotions = properties.get("emotions")
+        if emotions and isinstance(emotions, dict):
+            # Bind the enrichment, artifact and attribute types to locals once
+            # for all users
+            enrich = self._enrich_creator_with_name
+            new_art = jsonFile.newArtifact
+            stage = self._staging.artifacts.append
+            reaction_type_id = self.art_reaction.getTypeID()
+            a_tenantid = self._a_tenantid
+            a_msg_id = self._a_reaction_msg_id
+            a_seq_id = self._a_reaction_seq_id
+            a_type = self._a_reaction_type
+            a_mri = self._a_reaction_mri
+            a_time = self._a_reaction_time
+            seq_text = str(seq_id)
+            # addAttributes copies the attributes out of the collection, so a
+            # single buffer is cleared and reused for every reaction
+            attrs = ArrayList(6)
+            
+            for reaction_type, mri, time_val in _iter_reaction_users(emotions):
+                # Entries left behind by retracted reactions carry nothing to report
+                if not (reaction_type or mri or time_val):
+                    continue
+                time_val = self._convert_timestamp(time_val, for_datetime_attr=True)
+                
+                # Enrich MRI with contact name in parentheses
+                if mri:
+                    enriched_mri = enrich(mri)
+                else:
+                    enriched_mri = mri
+                
+                # Create reaction artifact
+                art_react = new_art(reaction_type_id)
+                attrs.clear()
+                attrs.add(BlackboardAttribute(a_tenantid, ARTIFACT_PREFIX, tenant_id))
+                attrs.add(BlackboardAttribute(a_msg_id, ARTIFACT_PREFIX, msg_id))
+                attrs.add(BlackboardAttribute(a_seq_id, ARTIFACT_PREFIX, seq_text))
+                
+                # Optional attributes are only added when they have a value
+                if reaction_type:
+                    attrs.add(BlackboardAttribute(a_type, ARTIFACT_PREFIX, reaction_type))
+                if enriched_mri:
+                    attrs.add(BlackboardAttribute(a_mri, ARTIFACT_PREFIX, enriched_mri))
+                if time_val:
+                    attrs.add(BlackboardAttribute(a_time, ARTIFACT_PREFIX, time_val))
+                art_react.addAttributes(attrs)
+                
+                # Indexed in a batch with the other artifacts of the file
+                stage(art_react)